@@ -1,31 +1,483 @@
+import csv
+import io
 import numpy as np
 import os
 import json
+import sys
+import weakref
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
+from itertools import chain
 from typing import Dict, Any, List, Tuple
 from models import Manager
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from scipy import stats
+except ImportError:
+    stats = None
+
+K_VALUES = (1, 3, 5, 10)
+
+# DCG discount 1/log2(rank + 1) for ranks 1..10, and the ideal DCG@10 of a
+# PR with 1..10 actual reviewers (cumulative discount)
+_DCG_DISCOUNT = 1.0 / np.log2(np.arange(2, 12))
+_IDCG = np.cumsum(_DCG_DISCOUNT)
+
+# Per-PR buffer layout: top-k hit counts for each k, reciprocal rank, AP,
+# DCG@10, NDCG@10, then precision, recall and F1 for each k
+_PER_PR_COLUMNS = 4 * len(K_VALUES) + 4
+_PER_PR_COLUMN_NAMES = (
+    *(f'hits_at_{k}' for k in K_VALUES),
+    'mrr_scores', 'ap_scores', 'dcg_scores', 'ndcg_scores',
+    *(f'{metric}_at_{k}' for metric in ('precision', 'recall', 'f1') for k in K_VALUES)
+)
+
+# PRs are scored in blocks so the per-block arrays and ground-truth mask stay small
+_BATCH_SIZE = 1024
+
+# Ground truth per Manager, with the (reviews, pull requests) counts it was
+# built from. Weak keys, so a discarded Manager drops its entry.
+_GROUND_TRUTH_CACHE: "weakref.WeakKeyDictionary[Manager, Tuple[Tuple[int, int], Dict[int, frozenset]]]" = \
+    weakref.WeakKeyDictionary()
+
+# Headline metrics shared by the comparison table, rankings and insights,
+# as (category, key) into an algorithm's metrics
+_COMPARISON_COLUMNS = (
+    ('precision_metrics', 'precision_at_1'),
+    ('recall_metrics', 'recall_at_1'),
+    ('f1_metrics', 'f1_at_1'),
+    ('precision_metrics', 'precision_at_5'),
+    ('recall_metrics', 'recall_at_5'),
+    ('f1_metrics', 'f1_at_5'),
+    ('ranking_metrics', 'mrr'),
+    ('ranking_metrics', 'map'),
+    ('ranking_metrics', 'avg_ndcg'),
+)
+
+
+def _fill_per_pr_numpy(scores: np.ndarray, rel: np.ndarray, offsets: np.ndarray, gt_sizes: np.ndarray,
+                       out: np.ndarray, out_rows: np.ndarray):
+    """Vectorized equivalent of _fill_per_pr_loop, used when Numba is not installed"""
+    num_prs = offsets.size - 1
+    lengths = np.diff(offsets)
+    rows = np.repeat(np.arange(num_prs), lengths)
+    cols = np.arange(scores.size) - offsets[rows]
+    
+    # Padded (PRs, max recommendations) scores; NaN padding never compares
+    # greater or equal, so it never ranks ahead of a real recommendation
+    padded = np.full((num_prs, int(lengths.max())), np.nan)
+    padded[rows, cols] = scores
+    
+    # Rank of each hit = recommendations scored higher, or tied and listed earlier
+    hits = np.flatnonzero(rel)
+    hit_rows = rows[hits]
+    hit_scores = scores[hits][:, None]
+    row_scores = padded[hit_rows]
+    ranks = (
+        np.count_nonzero(row_scores > hit_scores, axis=1)
+        + np.count_nonzero((row_scores == hit_scores) & (np.arange(padded.shape[1]) < cols[hits][:, None]), axis=1)
+    )
+    # Hits grouped by PR (already) and in rank order within each PR
+    ranks = ranks[np.lexsort((ranks, hit_rows))]
+    
+    num_hits = np.bincount(hit_rows, minlength=num_prs)
+    first_hit = np.cumsum(num_hits) - num_hits
+    # 1-based position of each hit among its PR's hits
+    hit_position = np.arange(1, ranks.size + 1) - np.repeat(first_hit, num_hits)
+    
+    num_k = len(K_VALUES)
+    per_pr = np.empty((num_prs, _PER_PR_COLUMNS))
+    for k_idx, k in enumerate(K_VALUES):
+        per_pr[:, k_idx] = np.bincount(hit_rows, weights=ranks < k, minlength=num_prs)
+    per_pr[:, num_k] = 1.0 / (ranks[first_hit] + 1)
+    # AP: precision (# hits so far / rank) at each hit position
+    per_pr[:, num_k + 1] = np.bincount(hit_rows, weights=hit_position / (ranks + 1), minlength=num_prs) / num_hits
+    top_ranks = ranks < _DCG_DISCOUNT.size
+    per_pr[:, num_k + 2] = np.bincount(hit_rows[top_ranks], weights=_DCG_DISCOUNT[ranks[top_ranks]], minlength=num_prs)
+    
+    # NDCG@10 (ideal DCG puts every actual reviewer first), then precision,
+    # recall and F1 as (PRs, len(K_VALUES)) blocks: every k in one pass
+    np.divide(per_pr[:, num_k + 2], _IDCG[np.minimum(gt_sizes, 10) - 1], out=per_pr[:, num_k + 3])
+    num_correct = per_pr[:, :num_k]
+    precision, recall, f1 = (per_pr[:, start:start + num_k] for start in range(num_k + 4, _PER_PR_COLUMNS, num_k))
+    np.divide(num_correct, np.asarray(K_VALUES), out=precision)
+    np.divide(num_correct, gt_sizes[:, None], out=recall)
+    precision_plus_recall = precision + recall
+    f1[...] = 0.0
+    np.divide(2 * (precision * recall), precision_plus_recall, out=f1, where=precision_plus_recall > 0)
+    out[out_rows] = per_pr
+
+
+def _fill_per_pr_loop(scores: np.ndarray, rel: np.ndarray, offsets: np.ndarray, gt_sizes: np.ndarray,
+                      out: np.ndarray, out_rows: np.ndarray):
+    """
+    Compute every per-PR metric of PRs that have at least one hit
+    
+    Ranking a PR only needs the ranks of its hits, so instead of sorting all
+    of its recommendations each hit is ranked by counting the
+    recommendations ahead of it. Compiled with Numba when available.
+    
+    Args:
+        scores: recommendation scores of all PRs, concatenated in each PR's
+            insertion order (ties rank by it, like sorted(..., reverse=True))
+        rel: True where the recommended developer actually reviewed the PR
+        offsets: (PRs + 1,) start of each PR's recommendations in scores
+        gt_sizes: (PRs,) number of actual reviewers of each PR
+        out: per-PR buffer (see _PER_PR_COLUMNS) the metrics are written to
+        out_rows: (PRs,) row of out for each PR
+    """
+    num_prs = offsets.size - 1
+    num_k = len(K_VALUES)
+    ranks = np.empty(scores.size, dtype=np.int64)
+    for i in range(num_prs):
+        start = offsets[i]
+        end = offsets[i + 1]
+        row = out_rows[i]
+        
+        # 0-based ranks of the hits, kept sorted by insertion
+        num_hits = 0
+        for j in range(start, end):
+            if rel[j]:
+                rank = 0
+                for m in range(start, end):
+                    if scores[m] > scores[j] or (scores[m] == scores[j] and m < j):
+                        rank += 1
+                pos = num_hits
+                while pos > 0 and ranks[pos - 1] > rank:
+                    ranks[pos] = ranks[pos - 1]
+                    pos -= 1
+                ranks[pos] = rank
+                num_hits += 1
+        
+        # Top-k hit counts, reciprocal rank, AP and DCG@10
+        for col in range(num_k + 3):
+            out[row, col] = 0.0
+        precision_sum = 0.0
+        for h in range(num_hits):
+            rank = ranks[h]
+            precision_sum += (h + 1) / (rank + 1)
+            if rank < _DCG_DISCOUNT.size:
+                out[row, num_k + 2] += _DCG_DISCOUNT[rank]
+            # Lists shorter than k count every hit
+            for k_idx in range(num_k):
+                if rank < K_VALUES[k_idx]:
+                    out[row, k_idx] += 1
+        out[row, num_k] = 1.0 / (ranks[0] + 1)
+        out[row, num_k + 1] = precision_sum / num_hits
+        
+        # NDCG@10, then precision, recall and F1 for each k
+        gt_size = gt_sizes[i]
+        out[row, num_k + 3] = out[row, num_k + 2] / _IDCG[min(gt_size, 10) - 1]
+        for k_idx in range(num_k):
+            num_correct = out[row, k_idx]
+            precision = num_correct / K_VALUES[k_idx]
+            recall = num_correct / gt_size
+            out[row, num_k + 4 + k_idx] = precision
+            out[row, 2 * num_k + 4 + k_idx] = recall
+            precision_plus_recall = precision + recall
+            out[row, 3 * num_k + 4 + k_idx] = (
+                2 * (precision * recall) / precision_plus_recall if precision_plus_recall > 0 else 0.0
+            )
+
+
+if njit is not None:
+    # nogil rather than parallel: algorithms are evaluated on concurrent
+    # threads, and Numba's parallel kernels must not be launched from them
+    _fill_per_pr = njit(nogil=True, cache=True)(_fill_per_pr_loop)
+else:
+    _fill_per_pr = _fill_per_pr_numpy
+
+
+def _numpy_default(o):
+    """Convert numpy types that the JSON serializer cannot handle to regular Python types"""
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _per_pr_metrics(per_pr_buffer: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Expose the filled per-PR buffer as per_pr_scores
+    
+    Args:
+        per_pr_buffer: (PRs, _PER_PR_COLUMNS) column-major buffer filled by
+            _fill_per_pr (all zeros for PRs without any hit)
+        
+    Returns:
+        Dict with metric name -> (PRs,) array, keyed like per_pr_scores; the
+        float metrics are contiguous column views of per_pr_buffer
+    """
+    num_k = len(K_VALUES)
+    num_correct = per_pr_buffer[:, :num_k]
+    mrr, ap, dcg, ndcg = per_pr_buffer[:, num_k:num_k + 4].T
+    precision, recall, f1 = (
+        per_pr_buffer[:, start:start + num_k]
+        for start in range(num_k + 4, _PER_PR_COLUMNS, num_k)
+    )
+    hit = (num_correct > 0).astype(np.int64)
+    
+    per_pr = {}
+    for k_idx, k in enumerate(K_VALUES):
+        per_pr[f'precision_at_{k}'] = precision[:, k_idx]
+        per_pr[f'recall_at_{k}'] = recall[:, k_idx]
+        per_pr[f'f1_at_{k}'] = f1[:, k_idx]
+        per_pr[f'hit_at_{k}'] = hit[:, k_idx]
+    
+    per_pr['mrr_scores'] = mrr
+    per_pr['ap_scores'] = ap
+    per_pr['dcg_scores'] = dcg
+    per_pr['ndcg_scores'] = ndcg
+    
+    return per_pr
+
+
+def _stability_stats(scores: np.ndarray, with_cv: bool = False) -> Dict[str, float]:
+    """Quartiles, IQR and spread of per-PR scores, with all three quantiles from one sort"""
+    q1, median, q3 = np.percentile(scores, [25, 50, 75])
+    std = scores.std()
+    result = {'q1': q1, 'q3': q3, 'iqr': q3 - q1, 'median': median, 'std': std}
+    if with_cv:
+        mean = scores.mean()
+        result['cv'] = std / mean if mean > 0 else 0
+    return result
+
+
+def _comparison_columns(detailed_metrics: Dict) -> Dict[str, tuple]:
+    """Look up each _COMPARISON_COLUMNS metric once: key -> values in algorithm order"""
+    rows = [
+        tuple(metrics.get(category, {}).get(key, 0) for category, key in _COMPARISON_COLUMNS)
+        for metrics in detailed_metrics.values()
+    ]
+    return {key: column for (_, key), column in zip(_COMPARISON_COLUMNS, zip(*rows))}
+
+
+def _algorithm_metrics(algo_result: Dict, ground_truth: Dict[int, frozenset]) -> Dict[str, Any]:
+    """
+    Calculate comprehensive metrics for a single algorithm
+    
+    Module-level and free of shared mutable state, so several algorithms can
+    be evaluated concurrently.
+    """
+    
+    # Basic statistics
+    total_prs_analyzed = len(algo_result)
+    recommended_devs = set(chain.from_iterable(algo_result.values()))
+    developers_recommended = len(recommended_devs)
+    
+    # All recommendations laid out once, CSR-style: PR i of algo_result owns
+    # flat_scores/flat_devs[offsets[i]:offsets[i + 1]], in insertion order
+    pr_rows = {pr_num: row for row, pr_num in enumerate(algo_result)}
+    offsets = np.zeros(total_prs_analyzed + 1, dtype=np.int64)
+    np.cumsum(
+        np.fromiter((len(scores) for scores in algo_result.values()), dtype=np.int64, count=total_prs_analyzed),
+        out=offsets[1:]
+    )
+    num_scores = int(offsets[-1])
+    flat_scores = np.fromiter(
+        chain.from_iterable(scores.values() for scores in algo_result.values()),
+        dtype=np.float64, count=num_scores
+    )
+    
+    # Developer name -> column id, shared by recommendations and ground truth
+    vocab = {dev: dev_id for dev_id, dev in enumerate(recommended_devs)}
+    stride = len(vocab)
+    flat_devs = np.fromiter(
+        map(vocab.__getitem__, chain.from_iterable(algo_result.values())),
+        dtype=np.int64, count=num_scores
+    )
+    
+    # Score distribution
+    score_stats = {}
+    if num_scores:
+        score_min = flat_scores.min()
+        score_max = flat_scores.max()
+        # Same arithmetic as ndarray.std(), reusing the mean instead of recomputing it
+        score_mean = flat_scores.mean()
+        squared_deviations = flat_scores - score_mean
+        np.multiply(squared_deviations, squared_deviations, out=squared_deviations)
+        score_stats = {
+            'mean': score_mean,
+            'median': np.median(flat_scores),
+            'std': np.sqrt(squared_deviations.sum() / num_scores),
+            'min': score_min,
+            'max': score_max,
+            'range': score_max - score_min
+        }
+    
+    # ============================================
+    # PER-PR SCORE STORAGE (NEW - CRITICAL!)
+    # ============================================
+    # Ground-truth PRs this algorithm has recommendations for. This is one
+    # pass with a dict lookup per PR; it deliberately keeps ground-truth order
+    # (rather than iterating a keys() intersection, whose order depends on the
+    # set sizes) so per-PR scores of different algorithms line up index by
+    # index for the statistical tests.
+    eval_prs = [pr_num for pr_num in ground_truth if algo_result.get(pr_num)]
+    valid_prs = len(eval_prs)
+    
+    # One float64 buffer for every per-PR metric, column-major so each metric
+    # is a contiguous column
+    per_pr_buffer = np.zeros((valid_prs, _PER_PR_COLUMNS), order='F')
+    gt_sizes = np.fromiter((len(ground_truth[pr_num]) for pr_num in eval_prs), dtype=np.int64, count=valid_prs)
+    
+    for start in range(0, valid_prs, _BATCH_SIZE):
+        block = eval_prs[start:start + _BATCH_SIZE]
+        
+        # Gather the block's recommendations from the flat layout; each PR
+        # keeps its insertion order so ties rank like sorted(..., reverse=True)
+        block_rows = np.fromiter(map(pr_rows.__getitem__, block), dtype=np.int64, count=len(block))
+        lengths = offsets[block_rows + 1] - offsets[block_rows]
+        total = int(lengths.sum())
+        rows = np.repeat(np.arange(len(block)), lengths)
+        positions = np.arange(total) + np.repeat(offsets[block_rows] - (np.cumsum(lengths) - lengths), lengths)
+        block_devs = flat_devs[positions]
+        
+        # Ground truth as a flattened (PRs, developers) mask, so relevance is
+        # a single gather at the (row, developer) keys instead of a search
+        gt_mask = np.zeros(len(block) * stride, dtype=bool)
+        gt_mask[[
+            row * stride + vocab[reviewer]
+            for row, pr_num in enumerate(block)
+            for reviewer in ground_truth[pr_num]
+            if reviewer in vocab
+        ]] = True
+        block_rel = gt_mask[rows * stride + block_devs]
+        
+        # Every metric is zero for a PR without hits (common on sparse ground
+        # truth), so only PRs with at least one hit are ranked
+        has_hit = np.bincount(rows[block_rel], minlength=len(block)) > 0
+        if not has_hit.any():
+            continue
+        hit_rows = np.flatnonzero(has_hit)
+        keep = has_hit[rows]
+        hit_offsets = np.zeros(hit_rows.size + 1, dtype=np.int64)
+        np.cumsum(lengths[hit_rows], out=hit_offsets[1:])
+        out_rows = start + hit_rows
+        _fill_per_pr(
+            flat_scores[positions[keep]], block_rel[keep], hit_offsets, gt_sizes[out_rows],
+            per_pr_buffer, out_rows
+        )
+    
+    per_pr_metrics = _per_pr_metrics(per_pr_buffer)
+    
+    # ============================================
+    # STABILITY METRICS (IQR, Q1, Q3)
+    # ============================================
+    stability_metrics = {}
+    if per_pr_metrics['mrr_scores'].size:
+        stability_metrics['mrr'] = _stability_stats(per_pr_metrics['mrr_scores'], with_cv=True)
+        
+        # Add stability for other key metrics
+        for metric_name in ['ap_scores', 'precision_at_5', 'recall_at_5']:
+            if per_pr_metrics[metric_name].size:
+                stability_metrics[metric_name] = _stability_stats(per_pr_metrics[metric_name])
+    
+    # ============================================
+    # COMPILE FINAL METRICS
+    # ============================================
+    metrics = {
+        'basic_stats': {
+            'total_prs_analyzed': total_prs_analyzed,
+            'developers_recommended': developers_recommended,
+            'valid_prs': valid_prs,
+            'coverage': valid_prs / len(ground_truth) if ground_truth else 0
+        },
+        'score_distribution': score_stats,
+        'precision_metrics': {},
+        'recall_metrics': {},
+        'f1_metrics': {},
+        'ranking_metrics': {},
+        'stability_metrics': stability_metrics,
+        'per_pr_scores': per_pr_metrics,  # Store for statistical testing!
+        'other_metrics': {}
+    }
+    
+    if valid_prs > 0:
+        # Every average in one reduction over the column-major per-PR buffer
+        mean_of = dict(zip(_PER_PR_COLUMN_NAMES, per_pr_buffer.mean(axis=0)))
+        hit_counts = np.count_nonzero(per_pr_buffer[:, :len(K_VALUES)], axis=0)
+        
+        # TRUE PRECISION METRICS
+        for k_idx, k in enumerate(K_VALUES):
+            metrics['precision_metrics'][f'precision_at_{k}'] = mean_of[f'precision_at_{k}']
+            metrics['precision_metrics'][f'hit_rate_at_{k}'] = int(hit_counts[k_idx]) / valid_prs
+        
+        # TRUE RECALL METRICS
+        for k in K_VALUES:
+            metrics['recall_metrics'][f'recall_at_{k}'] = mean_of[f'recall_at_{k}']
+        
+        # F1-SCORE METRICS
+        for k in K_VALUES:
+            metrics['f1_metrics'][f'f1_at_{k}'] = mean_of[f'f1_at_{k}']
+        
+        # Ranking metrics
+        metrics['ranking_metrics']['mrr'] = mean_of['mrr_scores']
+        metrics['ranking_metrics']['map'] = mean_of['ap_scores']
+        metrics['ranking_metrics']['avg_dcg'] = mean_of['dcg_scores']
+        metrics['ranking_metrics']['avg_ndcg'] = mean_of['ndcg_scores']  # NEW!
+        
+        # Additional metrics
+        metrics['other_metrics']['successful_recommendations'] = int(np.count_nonzero(per_pr_metrics['mrr_scores'] > 0))
+        metrics['other_metrics']['recommendation_success_rate'] = metrics['other_metrics']['successful_recommendations'] / valid_prs
+    
+    return metrics
+
+
 class AdvancedEvaluation:
     """
     Comprehensive evaluation system for reviewer recommendation algorithms.
     Provides detailed metrics suitable for thesis-level analysis.
     """
     
-    def __init__(self, manager: Manager):
+    def __init__(self, manager: Manager, keep_per_pr_in_export: bool = False):
         self.manager = manager
-        self.ground_truth = self._build_ground_truth()
+        # per_pr_scores hold every metric for every PR; they are returned for
+        # statistical testing but only written to the JSON export on request
+        self.keep_per_pr_in_export = keep_per_pr_in_export
+        
+        # Reuse the ground truth of an earlier evaluation of the same
+        # manager, unless reviews or pull requests were added since
+        data_size = (len(manager.reviews), len(manager.pull_requests))
+        cached = _GROUND_TRUTH_CACHE.get(manager)
+        if cached is not None and cached[0] == data_size:
+            self.ground_truth = cached[1]
+        else:
+            self.ground_truth = self._build_ground_truth()
+            _GROUND_TRUTH_CACHE[manager] = (data_size, self.ground_truth)
+    
+    @classmethod
+    def clear_cache(cls):
+        """Forget the ground truth cached for every manager"""
+        _GROUND_TRUTH_CACHE.clear()
         
-    def _build_ground_truth(self) -> Dict[int, set]:
+    def _build_ground_truth(self) -> Dict[int, frozenset]:
         """Build ground truth from actual reviews"""
+        # Bucket reviews by PR in one pass instead of rescanning all reviews per PR
+        reviewers_by_pr = defaultdict(set)
+        for review in self.manager.reviews_list:
+            reviewers_by_pr[review.pull_number].add(review.reviewer_username)
+        
         ground_truth = {}
         for pr in self.manager.pull_requests_list:
-            reviewers = [
-                review.reviewer_username
-                for review in self.manager.reviews_list
-                if review.pull_number == pr.number
-            ]
+            reviewers = reviewers_by_pr.get(pr.number)
             if reviewers:
-                ground_truth[pr.number] = set(reviewers)
+                ground_truth[pr.number] = frozenset(reviewers)
         return ground_truth
     
     def evaluate_algorithms(self, algorithm_results: Dict[str, Dict]) -> Dict[str, Any]:
@@ -59,26 +511,46 @@ class AdvancedEvaluation:
         print("ALGORITHM PERFORMANCE ANALYSIS")
         print(f"{'='*50}")
         
-        for algo_name, algo_result in algorithm_results.items():
-            print(f"\n--- {algo_name} Analysis ---")
-            
-            if not algo_result:
-                print(f"  No results from {algo_name}")
-                continue
-            
-            # Calculate comprehensive metrics
-            metrics = self._calculate_algorithm_metrics(algo_name, algo_result)
-            detailed_metrics[algo_name] = metrics
-            
-            # Display individual algorithm analysis
-            self._display_algorithm_analysis(algo_name, metrics, algo_result)
-        
-        # Display comparative analysis
-        if len(detailed_metrics) > 1:
-            self._display_comparative_analysis(detailed_metrics)
-            
-            # Statistical significance testing
-            self._perform_statistical_testing(detailed_metrics)
+        # Algorithms are independent and only read the ground truth, so their
+        # metrics are computed concurrently and displayed in the original order
+        to_evaluate = [(name, result) for name, result in algorithm_results.items() if result]
+        all_metrics = {}
+        if to_evaluate:
+            with ThreadPoolExecutor(max_workers=min(len(to_evaluate), os.cpu_count() or 1)) as executor:
+                futures = [
+                    executor.submit(self._calculate_algorithm_metrics, algo_name, algo_result)
+                    for algo_name, algo_result in to_evaluate
+                ]
+                for (algo_name, _), future in zip(to_evaluate, futures):
+                    all_metrics[algo_name] = future.result()
+        
+        # The report is collected in memory and written to stdout in one go
+        # rather than through hundreds of separate print calls
+        report = io.StringIO()
+        try:
+            with redirect_stdout(report):
+                for algo_name, algo_result in algorithm_results.items():
+                    print(f"\n--- {algo_name} Analysis ---")
+                    
+                    if not algo_result:
+                        print(f"  No results from {algo_name}")
+                        continue
+                    
+                    # Calculate comprehensive metrics
+                    metrics = all_metrics[algo_name]
+                    detailed_metrics[algo_name] = metrics
+                    
+                    # Display individual algorithm analysis
+                    self._display_algorithm_analysis(algo_name, metrics, algo_result)
+                
+                # Display comparative analysis
+                if len(detailed_metrics) > 1:
+                    self._display_comparative_analysis(detailed_metrics)
+                    
+                    # Statistical significance testing
+                    self._perform_statistical_testing(detailed_metrics)
+        finally:
+            sys.stdout.write(report.getvalue())
         
         # Save results
         self._save_evaluation_results(detailed_metrics)
@@ -87,236 +559,7 @@ class AdvancedEvaluation:
     
     def _calculate_algorithm_metrics(self, algo_name: str, algo_result: Dict) -> Dict[str, Any]:
         """Calculate comprehensive metrics for a single algorithm"""
-        
-        # Basic statistics
-        total_prs_analyzed = len(algo_result)
-        developers_recommended = len(set(dev for scores in algo_result.values() for dev in scores.keys()))
-        
-        # Score distribution
-        all_scores = [score for scores in algo_result.values() for score in scores.values()]
-        score_stats = {}
-        if all_scores:
-            score_stats = {
-                'mean': np.mean(all_scores),
-                'median': np.median(all_scores),
-                'std': np.std(all_scores),
-                'min': np.min(all_scores),
-                'max': np.max(all_scores),
-                'range': np.max(all_scores) - np.min(all_scores)
-            }
-        
-        # ============================================
-        # PER-PR SCORE STORAGE (NEW - CRITICAL!)
-        # ============================================
-        per_pr_metrics = {
-            'mrr_scores': [],
-            'ap_scores': [],
-            'dcg_scores': [],
-            'ndcg_scores': [],
-            'precision_at_1': [],
-            'precision_at_3': [],
-            'precision_at_5': [],
-            'precision_at_10': [],
-            'recall_at_1': [],
-            'recall_at_3': [],
-            'recall_at_5': [],
-            'recall_at_10': [],
-            'f1_at_1': [],
-            'f1_at_3': [],
-            'f1_at_5': [],
-            'f1_at_10': [],
-            'hit_at_1': [],
-            'hit_at_3': [],
-            'hit_at_5': [],
-            'hit_at_10': []
-        }
-        
-        # Aggregated metrics
-        hits_at_k = {1: 0, 3: 0, 5: 0, 10: 0}
-        reciprocal_ranks = []
-        average_precisions = []
-        dcg_scores = []
-        ndcg_scores = []
-        valid_prs = 0
-        
-        # ==============================
-        # TRUE PRECISION@K AND RECALL@K
-        # ==============================
-        k_values = [1, 3, 5, 10]
-        precision_at_k = {k: [] for k in k_values}
-        recall_at_k = {k: [] for k in k_values}
-        f1_at_k = {k: [] for k in k_values}
-        
-        for pr_num, actual_reviewers in self.ground_truth.items():
-            if pr_num not in algo_result:
-                continue
-                
-            # Get ranked recommendations
-            sorted_recs = sorted(algo_result[pr_num].items(), key=lambda x: x[1], reverse=True)
-            
-            if not sorted_recs:
-                continue
-            
-            # ==========================
-            # TRUE PRECISION AND RECALL
-            # ==========================
-            for k in k_values:
-                top_k = [rec[0] for rec in sorted_recs[:k]]
-                
-                # Number of correct recommendations in top-k
-                num_correct = len(set(top_k) & actual_reviewers)
-                
-                # PRECISION@k = (# correct in top-k) / k
-                precision = num_correct / k if k > 0 else 0
-                precision_at_k[k].append(precision)
-                per_pr_metrics[f'precision_at_{k}'].append(precision)
-                
-                # RECALL@k = (# correct in top-k) / (total actual reviewers)
-                recall = num_correct / len(actual_reviewers) if actual_reviewers else 0
-                recall_at_k[k].append(recall)
-                per_pr_metrics[f'recall_at_{k}'].append(recall)
-                
-                # F1-SCORE@k = 2 * (P * R) / (P + R)
-                if precision + recall > 0:
-                    f1 = 2 * (precision * recall) / (precision + recall)
-                else:
-                    f1 = 0
-                f1_at_k[k].append(f1)
-                per_pr_metrics[f'f1_at_{k}'].append(f1)
-                
-                # HIT@k (binary - did we get at least one correct?)
-                hit = 1 if num_correct > 0 else 0
-                per_pr_metrics[f'hit_at_{k}'].append(hit)
-                if hit:
-                    hits_at_k[k] += 1
-            
-            # ============================================
-            # MRR (Mean Reciprocal Rank)
-            # ============================================
-            mrr_for_this_pr = 0.0
-            for rank, (rec_reviewer, _) in enumerate(sorted_recs, 1):
-                if rec_reviewer in actual_reviewers:
-                    mrr_for_this_pr = 1.0 / rank
-                    break
-            reciprocal_ranks.append(mrr_for_this_pr)
-            per_pr_metrics['mrr_scores'].append(mrr_for_this_pr)
-            
-            # ============================================
-            # MAP (Mean Average Precision)
-            # ============================================
-            relevant_ranks = []
-            for rank, (rec_reviewer, _) in enumerate(sorted_recs, 1):
-                if rec_reviewer in actual_reviewers:
-                    relevant_ranks.append(rank)
-            
-            if relevant_ranks:
-                precisions = []
-                for i, rank in enumerate(relevant_ranks):
-                    precision_at_rank = (i + 1) / rank
-                    precisions.append(precision_at_rank)
-                ap = np.mean(precisions)
-            else:
-                ap = 0.0
-            average_precisions.append(ap)
-            per_pr_metrics['ap_scores'].append(ap)
-            
-            # ============================================
-            # DCG and NDCG
-            # ============================================
-            # DCG (Discounted Cumulative Gain)
-            dcg = 0.0
-            for rank, (rec_reviewer, score) in enumerate(sorted_recs[:10], 1):
-                relevance = 1.0 if rec_reviewer in actual_reviewers else 0.0
-                dcg += relevance / np.log2(rank + 1)
-            dcg_scores.append(dcg)
-            per_pr_metrics['dcg_scores'].append(dcg)
-            
-            # NDCG (Normalized DCG) - NEW!
-            num_relevant = min(len(actual_reviewers), 10)
-            if num_relevant > 0:
-                idcg = sum(1.0 / np.log2(rank + 1) for rank in range(1, num_relevant + 1))
-                ndcg = dcg / idcg if idcg > 0 else 0
-            else:
-                ndcg = 0
-            ndcg_scores.append(ndcg)
-            per_pr_metrics['ndcg_scores'].append(ndcg)
-            
-            valid_prs += 1
-        
-        # ============================================
-        # STABILITY METRICS (IQR, Q1, Q3)
-        # ============================================
-        stability_metrics = {}
-        if per_pr_metrics['mrr_scores']:
-            mrr_scores = np.array(per_pr_metrics['mrr_scores'])
-            stability_metrics = {
-                'mrr': {
-                    'q1': np.percentile(mrr_scores, 25),
-                    'q3': np.percentile(mrr_scores, 75),
-                    'iqr': np.percentile(mrr_scores, 75) - np.percentile(mrr_scores, 25),
-                    'median': np.median(mrr_scores),
-                    'std': np.std(mrr_scores),
-                    'cv': np.std(mrr_scores) / np.mean(mrr_scores) if np.mean(mrr_scores) > 0 else 0
-                }
-            }
-            
-            # Add stability for other key metrics
-            for metric_name in ['ap_scores', 'precision_at_5', 'recall_at_5']:
-                if per_pr_metrics[metric_name]:
-                    scores = np.array(per_pr_metrics[metric_name])
-                    stability_metrics[metric_name] = {
-                        'q1': np.percentile(scores, 25),
-                        'q3': np.percentile(scores, 75),
-                        'iqr': np.percentile(scores, 75) - np.percentile(scores, 25),
-                        'median': np.median(scores),
-                        'std': np.std(scores)
-                    }
-        
-        # ============================================
-        # COMPILE FINAL METRICS
-        # ============================================
-        metrics = {
-            'basic_stats': {
-                'total_prs_analyzed': total_prs_analyzed,
-                'developers_recommended': developers_recommended,
-                'valid_prs': valid_prs,
-                'coverage': valid_prs / len(self.ground_truth) if self.ground_truth else 0
-            },
-            'score_distribution': score_stats,
-            'precision_metrics': {},
-            'recall_metrics': {},
-            'f1_metrics': {},
-            'ranking_metrics': {},
-            'stability_metrics': stability_metrics,
-            'per_pr_scores': per_pr_metrics,  # Store for statistical testing!
-            'other_metrics': {}
-        }
-        
-        if valid_prs > 0:
-            # TRUE PRECISION METRICS
-            for k in k_values:
-                metrics['precision_metrics'][f'precision_at_{k}'] = np.mean(precision_at_k[k])
-                metrics['precision_metrics'][f'hit_rate_at_{k}'] = hits_at_k[k] / valid_prs
-            
-            # TRUE RECALL METRICS
-            for k in k_values:
-                metrics['recall_metrics'][f'recall_at_{k}'] = np.mean(recall_at_k[k])
-            
-            # F1-SCORE METRICS
-            for k in k_values:
-                metrics['f1_metrics'][f'f1_at_{k}'] = np.mean(f1_at_k[k])
-            
-            # Ranking metrics
-            metrics['ranking_metrics']['mrr'] = np.mean(reciprocal_ranks)
-            metrics['ranking_metrics']['map'] = np.mean(average_precisions)
-            metrics['ranking_metrics']['avg_dcg'] = np.mean(dcg_scores)
-            metrics['ranking_metrics']['avg_ndcg'] = np.mean(ndcg_scores)  # NEW!
-            
-            # Additional metrics
-            metrics['other_metrics']['successful_recommendations'] = sum(1 for rr in reciprocal_ranks if rr > 0)
-            metrics['other_metrics']['recommendation_success_rate'] = metrics['other_metrics']['successful_recommendations'] / valid_prs
-        
-        return metrics
+        return _algorithm_metrics(algo_result, self.ground_truth)
     
     def _display_algorithm_analysis(self, algo_name: str, metrics: Dict, algo_result: Dict):
         """Display detailed analysis for a single algorithm"""
@@ -330,61 +573,66 @@ class AdvancedEvaluation:
         scores = metrics['score_distribution']
         other = metrics['other_metrics']
         
-        print(f"\n  Basic statistics:")
-        print(f"    PRs analyzed: {basic['total_prs_analyzed']}")
-        print(f"    Valid PRs: {basic['valid_prs']}")
-        print(f"    Coverage: {basic['coverage']:.4f}")
-        print(f"    Unique developers: {basic['developers_recommended']}")
+        # Collected and printed in one call
+        lines = []
+        
+        lines.append(f"\n  Basic statistics:")
+        lines.append(f"    PRs analyzed: {basic['total_prs_analyzed']}")
+        lines.append(f"    Valid PRs: {basic['valid_prs']}")
+        lines.append(f"    Coverage: {basic['coverage']:.4f}")
+        lines.append(f"    Unique developers: {basic['developers_recommended']}")
         
         if scores:
-            print(f"\n  Score statistics:")
-            print(f"    Mean: {scores['mean']:.4f}")
-            print(f"    Median: {scores['median']:.4f}")
-            print(f"    Std Dev: {scores['std']:.4f}")
-            print(f"    Range: [{scores['min']:.4f}, {scores['max']:.4f}]")
+            lines.append(f"\n  Score statistics:")
+            lines.append(f"    Mean: {scores['mean']:.4f}")
+            lines.append(f"    Median: {scores['median']:.4f}")
+            lines.append(f"    Std Dev: {scores['std']:.4f}")
+            lines.append(f"    Range: [{scores['min']:.4f}, {scores['max']:.4f}]")
         
         # ============================================
         #  OUTPUT: PRECISION, RECALL, F1
         # ============================================
         if precision and recall and f1:
-            print(f"\n  📊 METRICS:")
-            print(f"  {'k':<5} {'Precision':<12} {'Recall':<12} {'F1-Score':<12} {'Hit Rate':<12}")
-            print(f"  {'-'*53}")
+            lines.append(f"\n  📊 METRICS:")
+            lines.append(f"  {'k':<5} {'Precision':<12} {'Recall':<12} {'F1-Score':<12} {'Hit Rate':<12}")
+            lines.append(f"  {'-'*53}")
             for k in [1, 3, 5, 10]:
                 p = precision.get(f'precision_at_{k}', 0)
                 r = recall.get(f'recall_at_{k}', 0)
                 f = f1.get(f'f1_at_{k}', 0)
                 h = precision.get(f'hit_rate_at_{k}', 0)
-                print(f"  {k:<5} {p:<12.4f} {r:<12.4f} {f:<12.4f} {h:<12.4f}")
+                lines.append(f"  {k:<5} {p:<12.4f} {r:<12.4f} {f:<12.4f} {h:<12.4f}")
         
         if ranking:
-            print(f"\n  Ranking metrics:")
+            lines.append(f"\n  Ranking metrics:")
             if 'mrr' in ranking:
-                print(f"    MRR: {ranking['mrr']:.4f}")
+                lines.append(f"    MRR: {ranking['mrr']:.4f}")
             if 'map' in ranking:
-                print(f"    MAP: {ranking['map']:.4f}")
+                lines.append(f"    MAP: {ranking['map']:.4f}")
             if 'avg_dcg' in ranking:
-                print(f"    Avg DCG@10: {ranking['avg_dcg']:.4f}")
+                lines.append(f"    Avg DCG@10: {ranking['avg_dcg']:.4f}")
             if 'avg_ndcg' in ranking:
-                print(f"    Avg NDCG@10: {ranking['avg_ndcg']:.4f}")
+                lines.append(f"    Avg NDCG@10: {ranking['avg_ndcg']:.4f}")
         
         # ============================================
         # STABILITY ANALYSIS (IQR)
         # ============================================
         if stability and 'mrr' in stability:
-            print(f"\n  Stability metrics (MRR):")
+            lines.append(f"\n  Stability metrics (MRR):")
             mrr_stability = stability['mrr']
-            print(f"    Median: {mrr_stability['median']:.4f}")
-            print(f"    Q1: {mrr_stability['q1']:.4f}")
-            print(f"    Q3: {mrr_stability['q3']:.4f}")
-            print(f"    IQR: {mrr_stability['iqr']:.4f}")
-            print(f"    Std Dev: {mrr_stability['std']:.4f}")
-            print(f"    CV: {mrr_stability['cv']:.4f}")
+            lines.append(f"    Median: {mrr_stability['median']:.4f}")
+            lines.append(f"    Q1: {mrr_stability['q1']:.4f}")
+            lines.append(f"    Q3: {mrr_stability['q3']:.4f}")
+            lines.append(f"    IQR: {mrr_stability['iqr']:.4f}")
+            lines.append(f"    Std Dev: {mrr_stability['std']:.4f}")
+            lines.append(f"    CV: {mrr_stability['cv']:.4f}")
         
         if other:
-            print(f"\n  Success metrics:")
+            lines.append(f"\n  Success metrics:")
             if 'recommendation_success_rate' in other:
-                print(f"    Success Rate: {other['recommendation_success_rate']:.4f}")
+                lines.append(f"    Success Rate: {other['recommendation_success_rate']:.4f}")
+        
+        print('\n'.join(lines))
     
     def _display_comparative_analysis(self, detailed_metrics: Dict):
         """Display comprehensive comparison between algorithms"""
@@ -394,6 +642,7 @@ class AdvancedEvaluation:
         print(f"{'='*80}")
         
         algorithms = list(detailed_metrics.keys())
+        columns = _comparison_columns(detailed_metrics)
         
         # ============================================
         # COMPREHENSIVE TABLE WITH P, R, F1
@@ -403,23 +652,13 @@ class AdvancedEvaluation:
         print(header)
         print("-" * len(header))
         
-        for algo_name in algorithms:
-            metrics = detailed_metrics[algo_name]
-            p = metrics['precision_metrics']
-            r = metrics['recall_metrics']
-            f = metrics['f1_metrics']
-            rank = metrics['ranking_metrics']
-            
-            row = f"{algo_name:<12}"
-            row += f"{p.get('precision_at_1', 0):<8.4f}"
-            row += f"{r.get('recall_at_1', 0):<8.4f}"
-            row += f"{f.get('f1_at_1', 0):<8.4f}"
-            row += f"{p.get('precision_at_5', 0):<8.4f}"
-            row += f"{r.get('recall_at_5', 0):<8.4f}"
-            row += f"{f.get('f1_at_5', 0):<8.4f}"
-            row += f"{rank.get('mrr', 0):<8.4f}"
-            row += f"{rank.get('map', 0):<8.4f}"
-            print(row)
+        table_keys = ('precision_at_1', 'recall_at_1', 'f1_at_1',
+                      'precision_at_5', 'recall_at_5', 'f1_at_5', 'mrr', 'map')
+        row_format = "{:<12}" + "{:<8.4f}" * len(table_keys)
+        print('\n'.join(
+            row_format.format(*row)
+            for row in zip(algorithms, *(columns[key] for key in table_keys))
+        ))
         
         # ============================================
         # STABILITY COMPARISON (IQR)
@@ -429,81 +668,87 @@ class AdvancedEvaluation:
         print(header)
         print("-" * len(header))
         
+        rows = []
         for algo_name in algorithms:
             metrics = detailed_metrics[algo_name]
             if 'stability_metrics' in metrics and 'mrr' in metrics['stability_metrics']:
                 stab = metrics['stability_metrics']['mrr']
-                row = f"{algo_name:<12}"
-                row += f"{stab['median']:<10.4f}"
-                row += f"{stab['iqr']:<10.4f}"
-                row += f"{stab['std']:<10.4f}"
-                row += f"{stab['cv']:<10.4f}"
-                print(row)
+                rows.append(
+                    f"{algo_name:<12}"
+                    f"{stab['median']:<10.4f}{stab['iqr']:<10.4f}{stab['std']:<10.4f}{stab['cv']:<10.4f}"
+                )
+        if rows:
+            print('\n'.join(rows))
         
         # Algorithm rankings
-        self._display_rankings(detailed_metrics)
+        self._display_rankings(algorithms, columns)
         
         # Performance insights
-        self._display_performance_insights(detailed_metrics)
+        self._display_performance_insights(detailed_metrics, algorithms, columns)
     
-    def _display_rankings(self, detailed_metrics: Dict):
+    def _display_rankings(self, algorithms: List[str], columns: Dict[str, tuple]):
         """Display algorithm rankings by different metrics"""
         print(f"\n{'='*40}")
         print("ALGORITHM RANKINGS")
         print(f"{'='*40}")
         
         ranking_metrics = [
-            ('MRR', 'ranking_metrics', 'mrr'),
-            ('MAP', 'ranking_metrics', 'map'),
-            ('Precision@5', 'precision_metrics', 'precision_at_5'),
-            ('Recall@5', 'recall_metrics', 'recall_at_5'),
-            ('F1@5', 'f1_metrics', 'f1_at_5'),
-            ('NDCG@10', 'ranking_metrics', 'avg_ndcg')
+            ('MRR', 'mrr'),
+            ('MAP', 'map'),
+            ('Precision@5', 'precision_at_5'),
+            ('Recall@5', 'recall_at_5'),
+            ('F1@5', 'f1_at_5'),
+            ('NDCG@10', 'avg_ndcg')
         ]
         
-        for metric_name, category, key in ranking_metrics:
+        for metric_name, key in ranking_metrics:
             print(f"\nRanking by {metric_name}:")
-            ranked = sorted(
-                detailed_metrics.items(), 
-                key=lambda x: x[1].get(category, {}).get(key, 0), 
-                reverse=True
-            )
-            for rank, (algo_name, metrics) in enumerate(ranked, 1):
-                value = metrics.get(category, {}).get(key, 0)
-                print(f"  {rank}. {algo_name}: {value:.4f}")
+            values = columns[key]
+            # Stable sort: ties keep the algorithms' original order
+            ranked = sorted(range(len(algorithms)), key=values.__getitem__, reverse=True)
+            print('\n'.join(
+                f"  {rank}. {algorithms[idx]}: {values[idx]:.4f}"
+                for rank, idx in enumerate(ranked, 1)
+            ))
     
-    def _display_performance_insights(self, detailed_metrics: Dict):
+    def _display_performance_insights(self, detailed_metrics: Dict, algorithms: List[str], columns: Dict[str, tuple]):
         """Display performance insights and best performers"""
         print(f"\n{'='*40}")
         print("PERFORMANCE INSIGHTS")
         print(f"{'='*40}")
         
-        # Best performers
-        best_mrr = max(detailed_metrics.items(), key=lambda x: x[1]['ranking_metrics'].get('mrr', 0))
-        best_map = max(detailed_metrics.items(), key=lambda x: x[1]['ranking_metrics'].get('map', 0))
-        best_f1_5 = max(detailed_metrics.items(), key=lambda x: x[1]['f1_metrics'].get('f1_at_5', 0))
-        
-        # Find most stable (lowest IQR)
-        stable_algos = [
-            (name, metrics['stability_metrics']['mrr']['iqr'])
-            for name, metrics in detailed_metrics.items()
-            if 'stability_metrics' in metrics and 'mrr' in metrics['stability_metrics']
-        ]
-        if stable_algos:
-            most_stable = min(stable_algos, key=lambda x: x[1])
+        # Leaders of every metric in one sweep over the algorithms; strict
+        # comparisons keep the first algorithm on ties, as max/min do
+        mrr_scores = columns['mrr']
+        map_scores = columns['map']
+        f1_5_scores = columns['f1_at_5']
+        best_mrr = best_map = best_f1_5 = worst_mrr = 0
+        most_stable = None  # lowest MRR IQR
+        for idx, metrics in enumerate(detailed_metrics.values()):
+            if mrr_scores[idx] > mrr_scores[best_mrr]:
+                best_mrr = idx
+            if mrr_scores[idx] < mrr_scores[worst_mrr]:
+                worst_mrr = idx
+            if map_scores[idx] > map_scores[best_map]:
+                best_map = idx
+            if f1_5_scores[idx] > f1_5_scores[best_f1_5]:
+                best_f1_5 = idx
+            if 'stability_metrics' in metrics and 'mrr' in metrics['stability_metrics']:
+                iqr = metrics['stability_metrics']['mrr']['iqr']
+                if most_stable is None or iqr < most_stable[1]:
+                    most_stable = (algorithms[idx], iqr)
         
         print(f"\n🏆 Best Performers:")
-        print(f"  Best MRR: {best_mrr[0]} ({best_mrr[1]['ranking_metrics'].get('mrr', 0):.4f})")
-        print(f"  Best MAP: {best_map[0]} ({best_map[1]['ranking_metrics'].get('map', 0):.4f})")
-        print(f"  Best F1@5: {best_f1_5[0]} ({best_f1_5[1]['f1_metrics'].get('f1_at_5', 0):.4f})")
-        if stable_algos:
+        print(f"  Best MRR: {algorithms[best_mrr]} ({mrr_scores[best_mrr]:.4f})")
+        print(f"  Best MAP: {algorithms[best_map]} ({map_scores[best_map]:.4f})")
+        print(f"  Best F1@5: {algorithms[best_f1_5]} ({f1_5_scores[best_f1_5]:.4f})")
+        if most_stable is not None:
             print(f"  Most Stable: {most_stable[0]} (IQR: {most_stable[1]:.4f})")
         
         # Performance spread
-        mrr_scores = [metrics['ranking_metrics'].get('mrr', 0) for metrics in detailed_metrics.values()]
         if len(mrr_scores) > 1:
-            mrr_range = max(mrr_scores) - min(mrr_scores)
-            max_mrr = max(mrr_scores)
+            max_mrr = mrr_scores[best_mrr]
+            mrr_range = max_mrr - mrr_scores[worst_mrr]
             if max_mrr > 0:
                 print(f"\n📊 Performance Spread:")
                 print(f"  MRR Range: {mrr_range:.4f}")
@@ -519,10 +764,12 @@ class AdvancedEvaluation:
         print("STATISTICAL SIGNIFICANCE TESTING")
         print(f"{'='*60}")
         
+        if stats is None:
+            print("⚠️ scipy not installed - cannot perform statistical tests")
+            print("   Install with: pip install scipy")
+            return
+        
         try:
-            from scipy import stats
-            from scipy.stats import friedmanchisquare
-            
             # Extract per-PR MRR scores for each algorithm
             algorithms = list(detailed_metrics.keys())
             per_pr_scores = {}
@@ -547,7 +794,7 @@ class AdvancedEvaluation:
             
             # Perform Friedman test
             if len(aligned_scores) >= 2 and min_length >= 10:
-                statistic, p_value = friedmanchisquare(*aligned_scores)
+                statistic, p_value = stats.friedmanchisquare(*aligned_scores)
                 
                 print(f"\n📊 Friedman Test (MRR):")
                 print(f"  Chi-square statistic: {statistic:.4f}")
@@ -559,29 +806,33 @@ class AdvancedEvaluation:
                 else:
                     print(f"  ❌ No significant difference (p >= 0.05)")
                 
-                # Pairwise Wilcoxon tests
+                # Pairwise Wilcoxon tests, all pairs in one call on the
+                # stacked (pairs, PRs) score differences
                 print(f"\n📊 Pairwise Wilcoxon Signed-Rank Tests:")
-                for i in range(len(algorithms)):
-                    for j in range(i+1, len(algorithms)):
-                        algo1 = algorithms[i]
-                        algo2 = algorithms[j]
-                        
-                        if algo1 in per_pr_scores and algo2 in per_pr_scores:
-                            scores1 = per_pr_scores[algo1][:min_length]
-                            scores2 = per_pr_scores[algo2][:min_length]
-                            
-                            stat, p = stats.wilcoxon(scores1, scores2)
-                            
-                            sig = "✅" if p < 0.05 else "❌"
-                            print(f"  {algo1} vs {algo2}: p={p:.6f} {sig}")
+                tested = [algo_name for algo_name in algorithms if algo_name in per_pr_scores]
+                pairs = [(i, j) for i in range(len(tested)) for j in range(i + 1, len(tested))]
+                stacked = np.vstack(aligned_scores)
+                first, second = np.array(pairs).T
+                differences = stacked[first] - stacked[second]
+                
+                # wilcoxon's 'auto' method is picked once per call: exact only
+                # if no row has zero or tied differences. Pairs are split on
+                # that, so each gets the method it would get on its own.
+                sorted_abs = np.sort(np.abs(differences), axis=1)
+                exact_eligible = (sorted_abs[:, 0] != 0) & np.all(np.diff(sorted_abs, axis=1) != 0, axis=1)
+                p_values = np.empty(len(pairs))
+                for group in (exact_eligible, ~exact_eligible):
+                    if group.any():
+                        _, p_values[group] = stats.wilcoxon(differences[group], axis=1)
+                
+                for (i, j), p in zip(pairs, p_values):
+                    sig = "✅" if p < 0.05 else "❌"
+                    print(f"  {tested[i]} vs {tested[j]}: p={p:.6f} {sig}")
             
             else:
                 print("⚠️ Not enough data for statistical testing")
                 print(f"   Need at least 10 PRs, have {min_length}")
                 
-        except ImportError:
-            print("⚠️ scipy not installed - cannot perform statistical tests")
-            print("   Install with: pip install scipy")
         except Exception as e:
             print(f"⚠️ Error in statistical testing: {e}")
     
@@ -595,92 +846,103 @@ class AdvancedEvaluation:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         project_name = self.manager.project
         
+        export_metrics = detailed_metrics
+        if not self.keep_per_pr_in_export:
+            export_metrics = {
+                algo_name: {key: value for key, value in metrics.items() if key != 'per_pr_scores'}
+                for algo_name, metrics in detailed_metrics.items()
+            }
+        
         # Save detailed metrics as JSON
         metrics_file = f"{results_dir}/{project_name}_advanced_metrics_{timestamp}.json"
-        with open(metrics_file, 'w') as f:
-            # Convert numpy types to regular Python types for JSON serialization
-            json_metrics = self._convert_numpy_types(detailed_metrics)
-            json.dump(json_metrics, f, indent=2)
+        # numpy types are converted on the fly while serializing; orjson
+        # writes contiguous arrays natively (and NaN/inf as null)
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            with open(metrics_file, 'wb') as f:
+                # One algorithm at a time, so only a single algorithm's encoded
+                # metrics is in memory; nested one level deeper, so indented by 2
+                f.write(b'{')
+                for idx, (algo_name, metrics) in enumerate(export_metrics.items()):
+                    f.write(b',\n  ' if idx else b'\n  ')
+                    f.write(orjson.dumps(algo_name) + b': ')
+                    f.write(orjson.dumps(metrics, default=_numpy_default, option=option).replace(b'\n', b'\n  '))
+                f.write(b'\n}' if export_metrics else b'}')
+        else:
+            with open(metrics_file, 'w') as f:
+                # json.dump already encodes and writes incrementally
+                json.dump(export_metrics, f, indent=2, default=_numpy_default)
         
         # Save summary CSV
-        try:
-            import pandas as pd
+        # Flatten metrics for CSV
+        csv_data = []
+        for algo_name, metrics in detailed_metrics.items():
+            row = {'Algorithm': algo_name}
             
-            # Flatten metrics for CSV
-            csv_data = []
-            for algo_name, metrics in detailed_metrics.items():
-                row = {'Algorithm': algo_name}
-                
-                # Add basic stats
-                row.update({f"basic_{k}": v for k, v in metrics['basic_stats'].items()})
-                
-                # Add precision metrics
-                row.update({f"precision_{k}": v for k, v in metrics['precision_metrics'].items()})
-                
-                # Add recall metrics (NEW!)
-                row.update({f"recall_{k}": v for k, v in metrics['recall_metrics'].items()})
-                
-                # Add F1 metrics (NEW!)
-                row.update({f"f1_{k}": v for k, v in metrics['f1_metrics'].items()})
-                
-                # Add ranking metrics
-                row.update({f"ranking_{k}": v for k, v in metrics['ranking_metrics'].items()})
-                
-                # Add stability metrics (NEW!)
-                if metrics['stability_metrics'] and 'mrr' in metrics['stability_metrics']:
-                    for stat, value in metrics['stability_metrics']['mrr'].items():
-                        row[f'stability_mrr_{stat}'] = value
-                
-                # Add other metrics
-                row.update({f"other_{k}": v for k, v in metrics['other_metrics'].items()})
-                
-                # Add score distribution stats
-                if metrics['score_distribution']:
-                    row.update({f"score_{k}": v for k, v in metrics['score_distribution'].items()})
-                
-                csv_data.append(row)
+            # Add basic stats
+            row.update({f"basic_{k}": v for k, v in metrics['basic_stats'].items()})
             
-            df = pd.DataFrame(csv_data)
-            csv_file = f"{results_dir}/{project_name}_advanced_summary_{timestamp}.csv"
-            df.to_csv(csv_file, index=False)
+            # Add precision metrics
+            row.update({f"precision_{k}": v for k, v in metrics['precision_metrics'].items()})
             
-            print(f"\n💾 Results saved:")
-            print(f"  Detailed JSON: {metrics_file}")
-            print(f"  Summary CSV: {csv_file}")
+            # Add recall metrics (NEW!)
+            row.update({f"recall_{k}": v for k, v in metrics['recall_metrics'].items()})
+            
+            # Add F1 metrics (NEW!)
+            row.update({f"f1_{k}": v for k, v in metrics['f1_metrics'].items()})
             
-        except ImportError:
-            print(f"\n💾 Results saved:")
-            print(f"  Detailed JSON: {metrics_file}")
-            print("  (CSV export requires pandas - install with: pip install pandas)")
+            # Add ranking metrics
+            row.update({f"ranking_{k}": v for k, v in metrics['ranking_metrics'].items()})
+            
+            # Add stability metrics (NEW!)
+            if metrics['stability_metrics'] and 'mrr' in metrics['stability_metrics']:
+                for stat, value in metrics['stability_metrics']['mrr'].items():
+                    row[f'stability_mrr_{stat}'] = value
+            
+            # Add other metrics
+            row.update({f"other_{k}": v for k, v in metrics['other_metrics'].items()})
+            
+            # Add score distribution stats
+            if metrics['score_distribution']:
+                row.update({f"score_{k}": v for k, v in metrics['score_distribution'].items()})
+            
+            csv_data.append(row)
+        
+        # Nothing to summarize when no algorithm produced results
+        csv_file = None
+        if csv_data:
+            # Columns in first-seen order, blank where an algorithm lacks a metric
+            fieldnames = list(dict.fromkeys(key for row in csv_data for key in row))
+            csv_file = f"{results_dir}/{project_name}_advanced_summary_{timestamp}.csv"
+            with open(csv_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+                writer.writeheader()
+                # NaN cells stay blank, as pandas wrote them
+                writer.writerows(
+                    {key: '' if isinstance(value, float) and value != value else value for key, value in row.items()}
+                    for row in csv_data
+                )
+        
+        print(f"\n💾 Results saved:")
+        print(f"  Detailed JSON: {metrics_file}")
+        if csv_file:
+            print(f"  Summary CSV: {csv_file}")
         
         return metrics_file
-    
-    def _convert_numpy_types(self, obj):
-        """Convert numpy types to regular Python types for JSON serialization"""
-        if isinstance(obj, dict):
-            return {key: self._convert_numpy_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        elif isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        else:
-            return obj
 
 
 # ============================================
 # CONVENIENCE FUNCTION
 # ============================================
-def run_advanced_evaluation(manager: Manager, algorithm_results: Dict[str, Dict]) -> Dict[str, Any]:
+def run_advanced_evaluation(manager: Manager, algorithm_results: Dict[str, Dict],
+                            keep_per_pr_in_export: bool = False) -> Dict[str, Any]:
     """
     Convenience function to run advanced evaluation
     
     Args:
         manager: The data manager
         algorithm_results: Dict with algorithm_name -> {pr_number: {dev: score}}
+        keep_per_pr_in_export: Also write the per-PR scores to the JSON file
         
     Returns:
         Dict with detailed evaluation metrics
@@ -692,5 +954,5 @@ def run_advanced_evaluation(manager: Manager, algorithm_results: Dict[str, Dict]
             'KUREC': kurec_results
         })
     """
-    evaluator = AdvancedEvaluation(manager)
+    evaluator = AdvancedEvaluation(manager, keep_per_pr_in_export=keep_per_pr_in_export)
     return evaluator.evaluate_algorithms(algorithm_results)
\ No newline at end of file
@@ -1,11 +1,23 @@
+import io
 import os
+from contextlib import redirect_stdout
+from functools import lru_cache
 from utils import ManagerFactory
+from utils.discovery import discover_repositories
+from utils.output import buffered_output
+from utils.process_pool import manager_process_pool, shared_manager
 from const import DATA_BASE_DIR
-from algorithms import Sofia, RevFinder, ChRev, TurnoverRec
 
-def debug_algorithm_step_by_step(repo_name, algorithm_class, algorithm_name):
+@lru_cache(maxsize=4)
+def _load_manager(data_base_dir, repo_name):
+    """Build an uncached manager once per repository for the debug session."""
+    return ManagerFactory(data_base_dir, repo_name, from_cache=False).get_manager()
+
+@buffered_output
+def debug_algorithm_step_by_step(repo_name, algorithm_class, algorithm_name, manager=None, warmup=True):
     """
     Debug an algorithm step by step to see where it fails.
+    With warmup, JIT-compiled kernels are compiled before any step runs.
     """
     print(f"\n{'='*60}")
     print(f"DEBUGGING {algorithm_name} ALGORITHM")
@@ -13,9 +25,16 @@ def debug_algorithm_step_by_step(repo_name, algorithm_class, algorithm_name):
     
     try:
         # Create manager
-        manager = ManagerFactory(DATA_BASE_DIR, repo_name, from_cache=False).get_manager()
+        if manager is None:
+            manager = _load_manager(DATA_BASE_DIR, repo_name)
         print(f"Manager loaded: {len(manager.pull_requests_list)} PRs")
         
+        # Sofia runs TurnoverRec internally, so both use its JIT kernel
+        from algorithms import Sofia, TurnoverRec
+        if warmup and issubclass(algorithm_class, (Sofia, TurnoverRec)):
+            from algorithms.turnoverRec import warm_up
+            warm_up()
+        
         # Create algorithm instance
         algorithm = algorithm_class(manager)
         print(f"Algorithm instance created: {algorithm_name}")
@@ -39,6 +58,9 @@ def debug_sofia(sofia, manager):
     """Debug Sofia algorithm specifically"""
     print(f"\n--- SOFIA DEBUG ---")
     
+    prs = manager.pull_requests_list
+    sample_pr = prs[0] if prs else None
+    
     try:
         # Sofia uses ChRev and TurnoverRec internally
         print("1. Testing ChRev dependency...")
@@ -50,8 +72,7 @@ def debug_sofia(sofia, manager):
         print(f"   TurnoverRec returned: {len(turnover_result) if turnover_result else 0} PRs")
         
         # Test knowledgeable calculation for a sample PR
-        if manager.pull_requests_list:
-            sample_pr = manager.pull_requests_list[0]
+        if sample_pr is not None:
             print(f"3. Testing knowledgeable calculation for PR {sample_pr.number}...")
             
             knowledgeable = sofia._calc_knowledgeable(sample_pr)
@@ -66,6 +87,9 @@ def debug_chrev(chrev, manager):
     """Debug ChRev algorithm specifically"""
     print(f"\n--- CHREV DEBUG ---")
     
+    devs = manager.developers_list
+    sample_dev = devs[0] if devs else None
+    
     try:
         # Test with first few PRs
         pr_list = manager.pull_requests_list[:3]
@@ -84,8 +108,7 @@ def debug_chrev(chrev, manager):
             print(f"   Files with comments: {len(files_with_comments)}")
             
             # Test xFactor calculation for a sample developer
-            if manager.developers_list:
-                sample_dev = manager.developers_list[0]
+            if sample_dev is not None:
                 print(f"   Testing xFactor for developer: {sample_dev.username}")
                 
                 try:
@@ -103,15 +126,18 @@ def debug_turnover_rec(turnover, manager):
     """Debug TurnoverRec algorithm specifically"""
     print(f"\n--- TURNOVER REC DEBUG ---")
     
+    prs = manager.pull_requests_list
+    devs = manager.developers_list
+    sample_pr = prs[0] if prs else None
+    sample_dev = devs[0] if devs else None
+    
     try:
         # Test with a sample PR
-        if manager.pull_requests_list:
-            sample_pr = manager.pull_requests_list[0]
+        if sample_pr is not None:
             print(f"1. Testing with PR {sample_pr.number}...")
             
             # Test ReviewerKnows calculation
-            if manager.developers_list:
-                sample_dev = manager.developers_list[0]
+            if sample_dev is not None:
                 print(f"2. Testing ReviewerKnows for {sample_dev.username}...")
                 
                 try:
@@ -151,6 +177,9 @@ def debug_rev_finder(rev_finder, manager):
     """Debug RevFinder algorithm specifically"""
     print(f"\n--- REV FINDER DEBUG ---")
     
+    prs = manager.pull_requests_list
+    sample_pr = prs[0] if prs else None
+    
     try:
         # Test file similarity calculation
         print("1. Testing file similarity...")
@@ -161,8 +190,7 @@ def debug_rev_finder(rev_finder, manager):
             print(f"   File similarity error: {e}")
         
         # Test with a sample PR
-        if manager.pull_requests_list:
-            sample_pr = manager.pull_requests_list[0]
+        if sample_pr is not None:
             print(f"2. Testing with PR {sample_pr.number}...")
             print(f"   Files in PR: {sample_pr.file_paths}")
             
@@ -178,11 +206,21 @@ def debug_rev_finder(rev_finder, manager):
     except Exception as e:
         print(f"RevFinder debug error: {e}")
 
+def _debug_one(task):
+    """Run debug_algorithm_step_by_step in a worker process and return its output"""
+    repo_name, algorithm_class, algorithm_name = task
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        debug_algorithm_step_by_step(repo_name, algorithm_class, algorithm_name, shared_manager())
+    return buffer.getvalue()
+
 def debug_all_algorithms(repo_name):
     """Debug all algorithms for a repository"""
     print(f"🔍 DEBUGGING ALL ALGORITHMS FOR: {repo_name}")
     print("=" * 80)
     
+    from algorithms import Sofia, RevFinder, ChRev, TurnoverRec
+    
     algorithms = [
         (Sofia, "Sofia"),
         (ChRev, "ChRev"), 
@@ -190,10 +228,23 @@ def debug_all_algorithms(repo_name):
         (RevFinder, "RevFinder")
     ]
     
-    for algo_class, algo_name in algorithms:
-        debug_algorithm_step_by_step(repo_name, algo_class, algo_name)
+    try:
+        manager = _load_manager(DATA_BASE_DIR, repo_name)
+    except Exception as e:
+        print(f"Error loading manager: {e}")
+        return
+    
+    # The algorithm debugs are independent, so run them on separate cores
+    # and print their captured output in order once they are all done
+    tasks = [(repo_name, algo_class, algo_name) for algo_class, algo_name in algorithms]
+    with manager_process_pool(manager, min(len(tasks), os.cpu_count() or 1)) as executor:
+        outputs = list(executor.map(_debug_one, tasks))
+    
+    for output in outputs:
+        print(output, end="")
         print("\n" + "="*60 + "\n")
 
+@buffered_output
 def debug_data_relationships(repo_name):
     """Debug the relationships between different data components"""
     print(f"\n{'='*60}")
@@ -201,18 +252,12 @@ def debug_data_relationships(repo_name):
     print(f"{'='*60}")
     
     try:
-        manager = ManagerFactory(DATA_BASE_DIR, repo_name, from_cache=False).get_manager()
+        manager = _load_manager(DATA_BASE_DIR, repo_name)
         
         # Check PR-Review relationships
-        prs_with_reviews = 0
-        prs_without_reviews = 0
-        
-        for pr in manager.pull_requests_list:
-            pr_reviews = [r for r in manager.reviews_list if r.pull_number == pr.number]
-            if pr_reviews:
-                prs_with_reviews += 1
-            else:
-                prs_without_reviews += 1
+        reviews_by_pull = manager.reviews_by_pull
+        prs_with_reviews = sum(1 for pr in manager.pull_requests_list if pr.number in reviews_by_pull)
+        prs_without_reviews = len(manager.pull_requests_list) - prs_with_reviews
         
         print(f"PR-Review Relationships:")
         print(f"  PRs with reviews: {prs_with_reviews}")
@@ -234,7 +279,7 @@ def debug_data_relationships(repo_name):
         # Sample some relationships
         if manager.pull_requests_list:
             sample_pr = manager.pull_requests_list[0]
-            pr_reviews = [r for r in manager.reviews_list if r.pull_number == sample_pr.number]
+            pr_reviews = reviews_by_pull.get(sample_pr.number, ())
             
             print(f"\nSample PR {sample_pr.number}:")
             print(f"  Files: {len(sample_pr.file_paths)}")
@@ -250,14 +295,7 @@ def debug_data_relationships(repo_name):
 
 if __name__ == "__main__":
     # Interactive debug mode
-    repositories = []
-    if DATA_BASE_DIR and os.path.exists(DATA_BASE_DIR):
-        for item in os.listdir(DATA_BASE_DIR):
-            item_path = os.path.join(DATA_BASE_DIR, item)
-            if os.path.isdir(item_path):
-                if (os.path.exists(os.path.join(item_path, 'pull')) and 
-                    os.path.exists(os.path.join(item_path, 'commit'))):
-                    repositories.append(item)
+    repositories = discover_repositories(DATA_BASE_DIR)
     
     print("Available repositories:")
     for i, repo in enumerate(repositories, 1):
@@ -287,6 +325,9 @@ if __name__ == "__main__":
                 print("4. RevFinder")
                 
                 algo_choice = int(input("Select algorithm (1-4): "))
+                
+                from algorithms import Sofia, RevFinder, ChRev, TurnoverRec
+                
                 algorithms = [
                     (Sofia, "Sofia"),
                     (ChRev, "ChRev"),
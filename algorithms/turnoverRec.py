@@ -1,12 +1,104 @@
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import Dict
 
+import numpy as np
+
 from models import Developer, PullRequest
 from utils import Cache
 from utils.logger import info_logger
 from .base_simulator import BaseSimulator
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _count_past_year_activity_numpy(pr_time: int, times: np.ndarray, dev_ids: np.ndarray, months: np.ndarray,
+                                    counts: np.ndarray, active_months: np.ndarray) -> int:
+    """Vectorized equivalent of _count_past_year_activity_loop, used when Numba is not installed"""
+    in_year = np.abs((times - pr_time) // _MICROSECONDS_PER_DAY) <= 365
+    ids = dev_ids[in_year]
+    known = ids >= 0
+    ids = ids[known]
+    counts += np.bincount(ids, minlength=counts.size)
+    active_months[ids, months[in_year][known] - 1] = True
+    return int(np.count_nonzero(in_year))
+
+
+def _count_past_year_activity_loop(pr_time, times, dev_ids, months, counts, active_months):
+    """
+    Count the events (reviews or commits) within a year of a PR
+
+    Args:
+        pr_time: PR date in microseconds since the epoch
+        times: (events,) event dates in microseconds since the epoch
+        dev_ids: (events,) index of each event's developer in developers_list, -1 if unknown
+        months: (events,) calendar month (1-12) of each event
+        counts: (developers,) per-developer event counts, incremented in place
+        active_months: (developers, 12) set where a developer had an event in that month
+
+    Returns:
+        the number of events within a year of the PR, for all developers
+    """
+    total = 0
+    for i in range(times.size):
+        if abs((times[i] - pr_time) // _MICROSECONDS_PER_DAY) <= 365:
+            total += 1
+            dev = dev_ids[i]
+            if dev >= 0:
+                counts[dev] += 1
+                active_months[dev, months[i] - 1] = True
+    return total
+
+
+if njit is not None:
+    _count_past_year_activity = njit(nogil=True, cache=True)(_count_past_year_activity_loop)
+else:
+    _count_past_year_activity = _count_past_year_activity_numpy
+
+
+def warm_up():
+    """Compile the activity kernel on a one-event input so later timings exclude it"""
+    _count_past_year_activity(
+        0, np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64),
+        np.zeros(1, dtype=np.int64), np.zeros((1, 12), dtype=np.bool_),
+    )
+
 
 class TurnoverRec(BaseSimulator):
+    @staticmethod
+    def _to_microseconds(date: datetime) -> int:
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = date - _EPOCH
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+    def _activity_arrays(self, events, username_attr: str):
+        """(times, dev_ids, months) arrays of reviews or commits, dev_ids indexing developers_list"""
+        dev_index = {developer.username: index for index, developer in enumerate(self._manager.developers_list)}
+        times = np.empty(len(events), dtype=np.int64)
+        dev_ids = np.empty(len(events), dtype=np.int64)
+        months = np.empty(len(events), dtype=np.int64)
+        for i, event in enumerate(events):
+            date = self._parse_date_string(event.date)
+            times[i] = self._to_microseconds(date)
+            dev_ids[i] = dev_index.get(getattr(event, username_attr), -1)
+            months[i] = date.month
+        return times, dev_ids, months
+
+    @cached_property
+    def _review_activity(self):
+        return self._activity_arrays(self._manager.reviews_list, 'reviewer_username')
+
+    @cached_property
+    def _commit_activity(self):
+        return self._activity_arrays(self._manager.commits_list, 'username')
+
     def _calc_ReviewerKnows(self, developer: Developer, pr: PullRequest):
         files_paths = [
             _.filepath for _ in self._manager.review_files_list if
@@ -38,32 +130,34 @@ class TurnoverRec(BaseSimulator):
         return self.calc_diff_date(f_date, e_date) <= 365
 
     def _calc_totalCommitReview(self, pr: PullRequest):
-        return len([
-            _ for _ in self._manager.reviews_list if self._is_diff_under_year(pr.date, _.date)
-        ]) + len([
-            _ for _ in self._manager.commits_list if self._is_diff_under_year(pr.date, _.date)
-        ])
+        pr_time = self._to_microseconds(self._parse_date_string(pr.date))
+        return sum(
+            int(np.count_nonzero(np.abs((times - pr_time) // _MICROSECONDS_PER_DAY) <= 365))
+            for times, _, _ in (self._review_activity, self._commit_activity)
+        )
 
     def _calc_RetentionRec(self, pr: PullRequest):
         # {[dev_username]: float}
         retention: Dict[str, float] = {}
-        totalCommitReviews = self._calc_totalCommitReview(pr=pr)
-
-        for developer in self._manager.developers_list:
-            past_year_reviews = [
-                _ for _ in self._manager.reviews_list
-                if self._is_diff_under_year(pr.date, _.date) and _.reviewer_username == developer.username
-            ]
-            past_year_commits = [
-                _ for _ in self._manager.commits_list
-                if self._is_diff_under_year(pr.date, _.date) and _.username == developer.username
-            ]
-            contribution = len(past_year_reviews) + len(past_year_commits) / totalCommitReviews
-            past_year_active_months = {
-                *[self.get_date_month(_.date) for _ in past_year_reviews],
-                *[self.get_date_month(_.date) for _ in past_year_commits],
-            }
-            consistency = len(past_year_active_months) / 12
+        developers = self._manager.developers_list
+
+        # One pass over all reviews and commits instead of one per developer
+        pr_time = self._to_microseconds(self._parse_date_string(pr.date))
+        review_counts = np.zeros(len(developers), dtype=np.int64)
+        commit_counts = np.zeros(len(developers), dtype=np.int64)
+        active_months = np.zeros((len(developers), 12), dtype=np.bool_)
+        totalCommitReviews = _count_past_year_activity(
+            pr_time, *self._review_activity, review_counts, active_months
+        ) + _count_past_year_activity(
+            pr_time, *self._commit_activity, commit_counts, active_months
+        )
+
+        past_year_active_months = active_months.sum(axis=1).tolist()
+        for developer, reviews, commits, months in zip(
+                developers, review_counts.tolist(), commit_counts.tolist(), past_year_active_months
+        ):
+            contribution = reviews + commits / totalCommitReviews
+            consistency = months / 12
             retention[developer.username] = contribution * consistency
 
         return retention
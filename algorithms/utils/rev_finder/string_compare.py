@@ -41,7 +41,7 @@ def LCSubstr(f1, f2):
     f1 = path2List(f1)
     f2 = path2List(f2)
     common_path = 0
-    if len(set(f1) & set(f2)) > 0:
+    if not set(f1).isdisjoint(f2):
         mat = [[0 for x in range(len(f2) + 1)] for x in range(len(f1) + 1)]
         for i in range(len(f1) + 1):
             for j in range(len(f2) + 1):
@@ -58,7 +58,7 @@ def LCSubstr(f1, f2):
 def LCSubseq(f1, f2):
     f1 = path2List(f1)
     f2 = path2List(f2)
-    if len(set(f1) & set(f2)) > 0:
+    if not set(f1).isdisjoint(f2):
         L = [[0 for x in range(len(f2) + 1)] for x in range(len(f1) + 1)]
         for i in range(len(f1) + 1):
             for j in range(len(f2) + 1):
@@ -1,9 +1,112 @@
 import os
+import glob
 import json
+import pickle
+import hashlib
 from utils import ManagerFactory
+from utils.cache import CACHE_VERSION, PICKLE_PROTOCOL
+from utils.discovery import discover_repositories
+from utils.output import buffered_output
 from const import DATA_BASE_DIR
 from utils.logger import info_logger
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _scan_json_list(path):
+    """
+    Return (item count, first item) for a JSON list file, or None if it is not a list.
+    Streams the file with ijson when available instead of loading it whole,
+    otherwise parses it with orjson (or json).
+    """
+    if ijson is None:
+        if orjson is not None:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        if not isinstance(data, list):
+            return None
+        return len(data), (data[0] if data else None)
+    
+    with open(path, 'rb') as f:
+        if f.read(64).lstrip()[:1] != b'[':
+            return None
+        f.seek(0)
+        items = ijson.items(f, 'item', use_float=True)
+        first = next(items, None)
+        count = 1 + sum(1 for _ in items) if first is not None else 0
+        return count, first
+
+def _debug_input_digest(repo_path):
+    """
+    Digest of the (path, mtime, size) of every JSON file under pull/ and
+    commit/, so any change invalidates the debug caches keyed by it.
+    """
+    inputs = []
+    for folder in ('pull', 'commit'):
+        for root, _, file_names in os.walk(os.path.join(repo_path, folder)):
+            for file_name in file_names:
+                # Only the JSON inputs count, not the loader's pickle caches beside them
+                if not file_name.endswith('.json'):
+                    continue
+                file_path = os.path.join(root, file_name)
+                file_stat = os.stat(file_path)
+                inputs.append((os.path.relpath(file_path, repo_path), file_stat.st_mtime_ns, file_stat.st_size))
+    inputs.sort()
+    return hashlib.blake2b(repr((CACHE_VERSION, inputs)).encode(), digest_size=16).hexdigest()
+
+def _debug_cache_path(repo_path, kind, input_digest=None):
+    """
+    Cache file for a debug step's result. Pass input_digest when several
+    steps run together so the input files are only walked once.
+    """
+    if input_digest is None:
+        input_digest = _debug_input_digest(repo_path)
+    return os.path.join(repo_path, '.debug_cache', f'{kind}-{input_digest}.pkl')
+
+def _load_debug_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"  ⚠️  Ignoring unreadable debug cache {cache_path}: {e}")
+        return None
+
+def _store_debug_cache(cache_path, data):
+    """Write the cache atomically; a failed write only costs the cache, not the debug step"""
+    cache_dir, cache_name = os.path.split(cache_path)
+    tmp_path = f'{cache_path}.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=PICKLE_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        
+        # Drop entries of the same kind left behind by older inputs
+        kind_prefix = cache_name.split('-', 1)[0] + '-'
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.startswith(kind_prefix) and entry.name != cache_name:
+                    os.remove(entry.path)
+    except OSError as e:
+        info_logger.warning(f"Could not write debug cache {cache_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+@buffered_output
 def debug_crawled_data_structure(repo_name):
     """
     Debug function to inspect the actual crawled data structure
@@ -25,46 +128,53 @@ def debug_crawled_data_structure(repo_name):
     print(f"\n1. MAIN FOLDER STRUCTURE:")
     print("-" * 30)
     
-    for item in os.listdir(repo_path):
-        item_path = os.path.join(repo_path, item)
-        if os.path.isdir(item_path):
-            print(f"  📁 {item}/")
-        else:
-            print(f"  📄 {item}")
+    with os.scandir(repo_path) as it:
+        for entry in it:
+            if entry.is_dir():
+                print(f"  📁 {entry.name}/")
+            else:
+                print(f"  📄 {entry.name}")
     
     # Check pull folder structure
     pull_path = os.path.join(repo_path, 'pull')
-    if os.path.exists(pull_path):
+    if os.path.isdir(pull_path):
         print(f"\n2. PULL FOLDER STRUCTURE:")
         print("-" * 30)
         
+        # One pass over pull/ finds both all_data.json and the PR subdirectories
+        all_data_entry = None
+        pr_folders = []
+        with os.scandir(pull_path) as it:
+            for entry in it:
+                if entry.name == 'all_data.json':
+                    all_data_entry = entry
+                elif entry.name.isdigit() and entry.is_dir(follow_symlinks=False):
+                    pr_folders.append(entry.name)
+        
         # Check for all_data.json
         all_data_file = os.path.join(pull_path, 'all_data.json')
-        if os.path.exists(all_data_file):
+        if all_data_entry is not None:
             print(f"  ✅ pull/all_data.json exists")
             
             # Check file size and sample content
-            file_size = os.path.getsize(all_data_file)
+            file_size = all_data_entry.stat().st_size
             print(f"  📊 File size: {file_size} bytes")
             
             try:
-                with open(all_data_file, 'r') as f:
-                    data = json.load(f)
-                    print(f"  📊 Number of PRs: {len(data) if isinstance(data, list) else 'Not a list'}")
-                    
-                    if isinstance(data, list) and len(data) > 0:
-                        print(f"  📋 Sample PR structure:")
-                        sample_pr = data[0]
-                        for key in sample_pr.keys():
-                            print(f"    - {key}: {type(sample_pr[key])}")
+                scanned = _scan_json_list(all_data_file)
+                print(f"  📊 Number of PRs: {scanned[0] if scanned is not None else 'Not a list'}")
+                
+                if scanned is not None and scanned[0] > 0:
+                    print(f"  📋 Sample PR structure:")
+                    sample_pr = scanned[1]
+                    for key in sample_pr.keys():
+                        print(f"    - {key}: {type(sample_pr[key])}")
             except Exception as e:
                 print(f"  ❌ Error reading pull/all_data.json: {e}")
         else:
             print(f"  ❌ pull/all_data.json NOT found")
         
         # Check PR subdirectories
-        pr_folders = [item for item in os.listdir(pull_path) 
-                     if os.path.isdir(os.path.join(pull_path, item)) and item.isdigit()]
         print(f"  📊 PR subdirectories found: {len(pr_folders)}")
         
         if pr_folders:
@@ -72,16 +182,20 @@ def debug_crawled_data_structure(repo_name):
             sample_pr_path = os.path.join(pull_path, sample_pr_folder)
             print(f"  📋 Sample PR folder structure ({sample_pr_folder}):")
             
-            for subitem in os.listdir(sample_pr_path):
-                subitem_path = os.path.join(sample_pr_path, subitem)
-                if os.path.isdir(subitem_path):
-                    all_data_path = os.path.join(subitem_path, 'all_data.json')
-                    exists = "✅" if os.path.exists(all_data_path) else "❌"
-                    print(f"    📁 {subitem}/ {exists}")
+            # One glob finds every subfolder that has an all_data.json
+            with_all_data = {
+                os.path.basename(os.path.dirname(path))
+                for path in glob.glob(os.path.join(glob.escape(sample_pr_path), '*', 'all_data.json'))
+            }
+            with os.scandir(sample_pr_path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        exists = "✅" if entry.name in with_all_data else "❌"
+                        print(f"    📁 {entry.name}/ {exists}")
     
     # Check commit folder structure
     commit_path = os.path.join(repo_path, 'commit')
-    if os.path.exists(commit_path):
+    if os.path.isdir(commit_path):
         print(f"\n3. COMMIT FOLDER STRUCTURE:")
         print("-" * 30)
         
@@ -91,9 +205,8 @@ def debug_crawled_data_structure(repo_name):
             print(f"  ✅ commit/all_data.json exists")
             
             try:
-                with open(all_data_file, 'r') as f:
-                    data = json.load(f)
-                    print(f"  📊 Number of commits: {len(data) if isinstance(data, list) else 'Not a list'}")
+                scanned = _scan_json_list(all_data_file)
+                print(f"  📊 Number of commits: {scanned[0] if scanned is not None else 'Not a list'}")
             except Exception as e:
                 print(f"  ❌ Error reading commit/all_data.json: {e}")
         else:
@@ -101,13 +214,15 @@ def debug_crawled_data_structure(repo_name):
         
         # Check commit/all folder
         commit_all_path = os.path.join(commit_path, 'all')
-        if os.path.exists(commit_all_path):
-            commit_files = [f for f in os.listdir(commit_all_path) if f.endswith('.json')]
+        if os.path.isdir(commit_all_path):
+            with os.scandir(commit_all_path) as it:
+                commit_files = [entry.name for entry in it if entry.name.endswith('.json')]
             print(f"  📊 Individual commit files: {len(commit_files)}")
             print(f"  📋 Sample commit files: {commit_files[:3]}")
         else:
             print(f"  ❌ commit/all/ folder NOT found")
 
+@buffered_output
 def debug_data_loader(repo_name):
     """
     Debug the DataLoader to see what it's actually loading.
@@ -120,6 +235,7 @@ def debug_data_loader(repo_name):
     
     repo_path = os.path.join(DATA_BASE_DIR, repo_name)
     loader = DataLoader(repo_path)
+    pulls = []
     
     # Test loading pull requests
     print("\n1. TESTING PULL REQUEST LOADING:")
@@ -148,7 +264,7 @@ def debug_data_loader(repo_name):
         print(f"  ❌ Error loading commits: {e}")
     
     # Test loading individual PR data
-    if 'pulls' in locals() and pulls:
+    if pulls:
         sample_pr = pulls[0]
         pr_number = sample_pr.get('number')
         
@@ -177,7 +293,8 @@ def debug_data_loader(repo_name):
             except Exception as e:
                 print(f"  ❌ Error loading PR {pr_number} comments: {e}")
 
-def debug_data_converter(repo_name):
+@buffered_output
+def debug_data_converter(repo_name, input_digest=None):
     """
     Debug the DataConverter to see what it's producing.
     """
@@ -189,10 +306,17 @@ def debug_data_converter(repo_name):
         from utils.data_converter import DataConverter
         
         repo_path = os.path.join(DATA_BASE_DIR, repo_name)
-        converter = DataConverter(repo_path)
+        cache_path = _debug_cache_path(repo_path, 'converted', input_digest)
+        converted_data = _load_debug_cache(cache_path)
         
-        print("Running data conversion...")
-        converted_data = converter.load_and_convert()
+        if converted_data is not None:
+            print(f"Loaded converted data from debug cache: {cache_path}")
+        else:
+            converter = DataConverter(repo_path)
+            
+            print("Running data conversion...")
+            converted_data = converter.load_and_convert()
+            _store_debug_cache(cache_path, converted_data)
         
         print(f"\n📊 CONVERSION RESULTS:")
         print("-" * 30)
@@ -234,7 +358,8 @@ def debug_data_converter(repo_name):
         print(f"Traceback: {traceback.format_exc()}")
         return None
 
-def debug_manager_creation(repo_name):
+@buffered_output
+def debug_manager_creation(repo_name, input_digest=None):
     """
     Debug the Manager creation process.
     """
@@ -243,8 +368,15 @@ def debug_manager_creation(repo_name):
     print(f"{'='*60}")
     
     try:
-        factory = ManagerFactory(DATA_BASE_DIR, repo_name, from_cache=False)  # Force no cache
-        manager = factory.get_manager()
+        cache_path = _debug_cache_path(os.path.join(DATA_BASE_DIR, repo_name), 'manager', input_digest)
+        manager = _load_debug_cache(cache_path)
+        
+        if manager is not None:
+            print(f"Loaded manager from debug cache: {cache_path}")
+        else:
+            factory = ManagerFactory(DATA_BASE_DIR, repo_name, from_cache=False)  # Force no cache
+            manager = factory.get_manager()
+            _store_debug_cache(cache_path, manager)
         
         print(f"\n📊 MANAGER CONTENTS:")
         print("-" * 30)
@@ -285,11 +417,14 @@ def run_complete_debug(repo_name):
     # Step 2: Test data loader
     debug_data_loader(repo_name)
     
+    # Both cached steps are keyed by the same input files, so walk them once
+    input_digest = _debug_input_digest(os.path.join(DATA_BASE_DIR, repo_name))
+    
     # Step 3: Test data converter
-    converted_data = debug_data_converter(repo_name)
+    converted_data = debug_data_converter(repo_name, input_digest)
     
     # Step 4: Test manager creation
-    manager = debug_manager_creation(repo_name)
+    manager = debug_manager_creation(repo_name, input_digest)
     
     # Step 5: Summary
     print(f"\n{'='*60}")
@@ -319,14 +454,7 @@ def debug_mode():
     print("-" * 20)
     
     # Discover repositories
-    repositories = []
-    if DATA_BASE_DIR and os.path.exists(DATA_BASE_DIR):
-        for item in os.listdir(DATA_BASE_DIR):
-            item_path = os.path.join(DATA_BASE_DIR, item)
-            if os.path.isdir(item_path):
-                if (os.path.exists(os.path.join(item_path, 'pull')) and 
-                    os.path.exists(os.path.join(item_path, 'commit'))):
-                    repositories.append(item)
+    repositories = discover_repositories(DATA_BASE_DIR)
     
     if not repositories:
         print("No repositories found for debugging.")
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import List
 from ranx import compare, Qrels, Run
 
@@ -26,13 +27,13 @@ class Evaluation:
 
     @property
     def _qrels(self):
+        reviewers_by_pr = defaultdict(dict)
+        for _ in self._manager.reviews_list:
+            reviewers_by_pr[_.pull_number][_.reviewer_username] = 1
+
         data = {}
         for pr in self._manager.pull_requests_list:
-            mapping = {
-                _.reviewer_username: 1
-                for _ in self._manager.reviews_list
-                if _.pull_number == pr.number
-            }
+            mapping = reviewers_by_pr.get(pr.number)
             if mapping:
                 data[str(pr.number)] = mapping
         return Qrels(data)
@@ -1,6 +1,11 @@
+import heapq
 import os
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
 from algorithms import Sofia, RevFinder, ChRev, TurnoverRec
+from utils import discovery
 from utils import ManagerFactory
+from utils.process_pool import manager_process_pool, shared_manager
 from evaluation import Evaluation
 from const import DATA_BASE_DIR
 from utils.logger import info_logger
@@ -8,21 +13,11 @@ from utils.logger import info_logger
 
 def discover_repositories():
     """Find available crawled repositories"""
-    repositories = []
-    
     if not DATA_BASE_DIR or not os.path.exists(DATA_BASE_DIR):
         print("ERROR: DATA_BASE_DIR not set or directory doesn't exist")
-        return repositories
-    
-    for item in os.listdir(DATA_BASE_DIR):
-        item_path = os.path.join(DATA_BASE_DIR, item)
-        if os.path.isdir(item_path):
-            # Check if it looks like a repository folder
-            if (os.path.exists(os.path.join(item_path, 'pull')) and 
-                os.path.exists(os.path.join(item_path, 'commit'))):
-                repositories.append(item)
+        return []
     
-    return repositories
+    return discovery.discover_repositories(DATA_BASE_DIR)
 
 
 def select_repository():
@@ -50,10 +45,11 @@ def select_repository():
             print("Please enter a valid number.")
 
 
-def check_repository_data(repo_name):
+def check_repository_data(repo_name, factory=None):
     """Check repository data quality before running algorithms"""
     try:
-        factory = ManagerFactory(DATA_BASE_DIR, repo_name)
+        if factory is None:
+            factory = ManagerFactory(DATA_BASE_DIR, repo_name)
         summary = factory.get_data_summary()
         
         print(f"\nRepository Summary for {repo_name}:")
@@ -146,13 +142,15 @@ def select_algorithm():
             print("Please enter a valid number.")
 
 
-def run_single_algorithm(repo_name, algorithm_name, algorithm_class):
+def run_single_algorithm(repo_name, algorithm_name, algorithm_class, factory=None):
     """Run a single algorithm"""
     print(f"\nRunning {algorithm_name} on {repo_name}...")
     
     try:
         # Create manager
-        manager = ManagerFactory(DATA_BASE_DIR, repo_name).get_manager()
+        if factory is None:
+            factory = ManagerFactory(DATA_BASE_DIR, repo_name)
+        manager = factory.get_manager()
         
         # Run algorithm
         algorithm_instance = algorithm_class(manager)
@@ -164,16 +162,12 @@ def run_single_algorithm(repo_name, algorithm_name, algorithm_class):
         # Show some sample results
         if result:
             print("\nSample recommendations (first 3 PRs):")
-            count = 0
-            for pr_num, scores in result.items():
-                if count >= 3:
-                    break
+            for pr_num, scores in islice(result.items(), 3):
                 print(f"\nPR #{pr_num}:")
-                # Sort developers by score and show top 3
-                sorted_devs = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3]
-                for i, (dev, score) in enumerate(sorted_devs, 1):
+                # Show the top 3 developers by score (same order as a full stable sort)
+                top_devs = heapq.nlargest(3, scores.items(), key=lambda x: x[1])
+                for i, (dev, score) in enumerate(top_devs, 1):
                     print(f"  {i}. {dev}: {score:.3f}")
-                count += 1
         
         return result
         
@@ -188,13 +182,65 @@ def run_single_algorithm(repo_name, algorithm_name, algorithm_class):
         return None
 
 
-def run_evaluation(repo_name):
+# Sofia combines the ChRev and TurnoverRec results, so it is only started once
+# both have finished and stored them in the simulation cache
+_ALGORITHM_DEPENDENCIES = {"Sofia": ("ChRev", "TurnoverRec")}
+
+
+def _run_one(algo_class):
+    """Run one algorithm on the pool's shared manager"""
+    return algo_class(shared_manager()).simulate()
+
+
+def _run_algorithms_in_parallel(manager, algorithms):
+    """
+    Run the algorithms on separate cores and return {name: result or None}.
+    """
+    outcomes = {}
+    pending = dict(algorithms)
+    names = set(pending)
+    max_workers = min(len(algorithms), os.cpu_count() or 1)
+    with manager_process_pool(manager, max_workers) as executor:
+        futures = {}
+        while pending or futures:
+            # Start every algorithm whose dependencies have finished
+            for algo_name in list(pending):
+                deps = _ALGORITHM_DEPENDENCIES.get(algo_name, ())
+                if all(dep in outcomes or dep not in names for dep in deps):
+                    print(f"  Running {algo_name}...")
+                    futures[executor.submit(_run_one, pending.pop(algo_name))] = algo_name
+            
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                algo_name = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = None
+                    print(f"  ❌ {algo_name} failed: {e}")
+                else:
+                    if result:
+                        print(f"  ✅ {algo_name} completed ({len(result)} PRs)")
+                    else:
+                        print(f"  ❌ {algo_name} returned no results")
+                outcomes[algo_name] = result
+    
+    return outcomes
+
+
+def run_evaluation(repo_name, factory=None):
     """Run comprehensive evaluation with all algorithms"""
     print(f"\nRunning comprehensive evaluation for {repo_name}...")
     
     try:
         # Create manager
-        manager = ManagerFactory(DATA_BASE_DIR, repo_name).get_manager()
+        if factory is None:
+            factory = ManagerFactory(DATA_BASE_DIR, repo_name)
+        manager = factory.get_manager()
+        
+        # Warm the shared list views once, so forked workers inherit them built
+        manager.pull_requests_list
+        manager.developers_list
         
         # Initialize algorithms and track results
         algorithms = [
@@ -205,23 +251,17 @@ def run_evaluation(repo_name):
             ("Sofia", Sofia),
         ]
         
+        outcomes = _run_algorithms_in_parallel(manager, algorithms)
+        
+        # Keep the results in the algorithm order, whatever order they finished in
         successful_results = {}
         failed_algorithms = []
-        
-        for algo_name, algo_class in algorithms:
-            try:
-                print(f"  Running {algo_name}...")
-                simulator = algo_class(manager)
-                result = simulator.simulate()
-                if result:
-                    successful_results[algo_name] = result
-                    print(f"  ✅ {algo_name} completed ({len(result)} PRs)")
-                else:
-                    failed_algorithms.append(algo_name)
-                    print(f"  ❌ {algo_name} returned no results")
-            except Exception as e:
+        for algo_name, _ in algorithms:
+            result = outcomes.get(algo_name)
+            if result:
+                successful_results[algo_name] = result
+            else:
                 failed_algorithms.append(algo_name)
-                print(f"  ❌ {algo_name} failed: {e}")
         
         if not successful_results:
             print("\n❌ No algorithms completed successfully. Cannot run evaluation.")
@@ -250,8 +290,12 @@ def main():
     if not repo_name:
         return
     
+    # One factory for the whole run, so the data converted for the
+    # summary is reused when the manager is built
+    factory = ManagerFactory(DATA_BASE_DIR, repo_name)
+    
     # Check repository data quality
-    if not check_repository_data(repo_name):
+    if not check_repository_data(repo_name, factory):
         print("Cannot proceed with current repository.")
         return
     
@@ -261,10 +305,10 @@ def main():
     if action == 1:
         # Single algorithm
         algo_name, algo_class = select_algorithm()
-        run_single_algorithm(repo_name, algo_name, algo_class)
+        run_single_algorithm(repo_name, algo_name, algo_class, factory)
     else:
         # Full evaluation
-        run_evaluation(repo_name)
+        run_evaluation(repo_name, factory)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,28 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, fields
 
 
-@dataclass
+@dataclass(frozen=True)
 class Contribution:
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ('filename', 'username', 'commit_id', 'date')
+
     filename: str
     username: str
     commit_id: str
     date: str
+
+    def __post_init__(self):
+        # The same few usernames, filenames and commit dates repeat across
+        # contributions, so share one string object per distinct value
+        object.__setattr__(self, 'filename', sys.intern(self.filename))
+        object.__setattr__(self, 'username', sys.intern(self.username))
+        object.__setattr__(self, 'date', sys.intern(self.date))
+
+    # Pickle restores slot state with setattr, which a frozen dataclass rejects
+    def __getstate__(self):
+        return [getattr(self, field.name) for field in fields(self)]
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
@@ -1,5 +1,5 @@
 from functools import cached_property
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from .commit import Commit
 from .pull_request import PullRequest
@@ -52,6 +52,13 @@ class Manager:
     def reviews_list(self):
         return list(self.reviews.values())
 
+    @cached_property
+    def reviews_by_pull(self):
+        reviews_by_pull = {}
+        for review in self.reviews.values():
+            reviews_by_pull.setdefault(review.pull_number, []).append(review)
+        return reviews_by_pull
+
     @cached_property
     def commits_list(self):
         return list(self.commits.values())
@@ -89,3 +96,29 @@ class Manager:
 
     def add_review_file(self, review_file: ReviewFile):
         self.review_files.append(review_file)
+
+    def bulk_add_comments(self, comments: Iterable[Comment]):
+        for comment in comments:
+            self.comments.setdefault(comment.filename, []).append(comment)
+
+    def bulk_add_files(self, files: Iterable[File]):
+        self.files.update((file.filepath, file) for file in files)
+
+    def bulk_add_developers(self, developers: Iterable[Developer]):
+        self.developers.update((developer.username, developer) for developer in developers)
+
+    def bulk_add_contributions(self, contributions: Iterable[Contribution]):
+        for contribution in contributions:
+            self.contributions.setdefault(contribution.filename, []).append(contribution)
+
+    def bulk_add_pull_requests(self, pull_requests: Iterable[PullRequest]):
+        self.pull_requests.update((pr.number, pr) for pr in pull_requests)
+
+    def bulk_add_commits(self, commits: Iterable[Commit]):
+        self.commits.update((commit.id, commit) for commit in commits)
+
+    def bulk_add_reviews(self, reviews: Iterable[Review]):
+        self.reviews.update((review.id, review) for review in reviews)
+
+    def bulk_add_review_files(self, review_files: Iterable[ReviewFile]):
+        self.review_files.extend(review_files)
@@ -3,6 +3,11 @@ import os
 import shutil
 
 CACHE_DIR = '.cache'
+# Protocol 5 (PEP 574) is the newest one every supported Python can read back
+PICKLE_PROTOCOL = 5
+# Bumped whenever a model's pickled layout changes, so older caches are not loaded
+# v2: Contribution became a slots dataclass
+CACHE_VERSION = 2
 if not os.path.exists(CACHE_DIR):
     os.mkdir(CACHE_DIR)
 
@@ -76,6 +81,15 @@ class Cache:
                 # Remove single file
                 os.remove(final_filepath)
     
+    @classmethod
+    def remove_stale(cls, prefix, keep):
+        """
+        Remove every cache entry named prefix or prefix.<suffix>, except keep.
+        """
+        for name in os.listdir(CACHE_DIR):
+            if name != keep and (name == prefix or name.startswith(f'{prefix}.')):
+                cls._remove_existing_key(name)
+    
     @classmethod
     def _store_chunk(cls, key, data):
         final_filepath = cls._get_file_location(key)
@@ -95,14 +109,14 @@ class Cache:
         os.mkdir(final_filepath)
         for index, chunk in enumerate(cls._chunk_data(converted_data, chunk_size=50 * 1000 * 1000)):
             with open(f'{final_filepath}/{index}', 'wb') as f:
-                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(chunk, f, protocol=PICKLE_PROTOCOL)
         
         with open(f'{final_filepath}/{Meta.FILE_NAME}', 'wb') as f:
-            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(meta, f, protocol=PICKLE_PROTOCOL)
     
     @classmethod
     def _store(cls, key, data):
         final_filepath = cls._get_file_location(key)
         cls._remove_existing_key(key)
         with open(final_filepath, 'wb') as f:
-            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)  
\ No newline at end of file
+            pickle.dump(data, f, protocol=PICKLE_PROTOCOL)  
\ No newline at end of file
@@ -1,20 +1,133 @@
 import os
 import json
+import mmap
+import pickle
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
+from utils.cache import PICKLE_PROTOCOL
 from utils.logger import info_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json_file(path, use_mmap=False):
+    """
+    Parse a JSON file with orjson when available, otherwise with json.
+    With use_mmap, orjson parses the memory-mapped file directly instead of
+    a bytes copy of it, which halves peak memory on large files.
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+        with open(path, 'rb') as f:
+            if use_mmap and os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_legacy_file(file_name):
+    """Returns (ok, parsed data) for one legacy JSON file, logging any error"""
+    info_logger.info(f"Loading legacy file: {file_name}")
+    try:
+        return True, _read_json_file(file_name)
+    except json.JSONDecodeError as e:
+        info_logger.error(f"JSON decode error in {file_name}: {e}")
+    except Exception as e:
+        info_logger.error(f"Error reading {file_name}: {e}")
+    return False, None
+
+
+def _iter_legacy_items(results):
+    """Flatten _read_legacy_file results: a list file contributes its items, any other value itself"""
+    for ok, file_data in results:
+        if not ok:
+            continue
+        # JSON parsers only ever build plain lists, so an exact type check suffices
+        if type(file_data) is list:
+            yield from file_data
+        else:
+            yield file_data
+
+
+# Only the top-level lists are big enough to be worth a pickle beside them; the
+# per-PR comments/, files/ and reviews/ folders are tiny and rebuilt into the
+# cached Manager anyway
+_CACHED_FOLDERS = ('pull', 'commit')
+
+
+def legacy_files_digest(json_files):
+    """Digest of the names, mtimes and sizes of a legacy folder's *.json files"""
+    file_stats = []
+    for file_name in sorted(json_files):
+        file_stat = os.stat(file_name)
+        file_stats.append((os.path.basename(file_name), file_stat.st_mtime_ns, file_stat.st_size))
+    return hashlib.blake2b(repr(file_stats).encode(), digest_size=16).hexdigest()
+
+
+def _load_pickle_cache(cache_path, key):
+    """
+    Load data pickled next to its JSON source by _store_pickle_cache.
+    Returns None when there is no cache or it was written for another key.
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        info_logger.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None
+
+
+def _store_pickle_cache(cache_path, key, data):
+    """Atomically write key then data, so a stale cache is rejected without unpickling its data"""
+    tmp_path = f'{cache_path}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(key, f, protocol=PICKLE_PROTOCOL)
+            pickle.dump(data, f, protocol=PICKLE_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        info_logger.warning(f"Could not write cache {cache_path}: {e}")
+
 
 class DataLoader:
     def __init__(self, folder_path):
         self._folder_path = folder_path
+        # Join the fixed directories once; read_raw_json_data_from_file runs per commit
+        self._pull_dir = os.path.join(folder_path, 'pull')
+        self._commit_dir = os.path.join(folder_path, 'commit')
+        self._commit_all_dir = os.path.join(self._commit_dir, 'all')
+        self._known_dirs = {
+            'pull': self._pull_dir,
+            'commit': self._commit_dir,
+            'commit/all': self._commit_all_dir,
+        }
         info_logger.info(f"DataLoader initialized with path: {folder_path}")
 
+    def _resolve_folder(self, folder_name):
+        """
+        Return the path of folder_name (e.g. 'commit/all' or 'pull/12/files') with native separators.
+        """
+        known_dir = self._known_dirs.get(folder_name)
+        if known_dir is not None:
+            return known_dir
+        return os.path.join(self._folder_path, *folder_name.split('/'))
+
     def read_list_raw_data_from_json_files(self, folder_name):
         """
         Read JSON data from folder. Handles both new crawled data format (single all_data.json)
         and legacy format (multiple .json files).
         """
-        final_folder = os.path.join(self._folder_path, folder_name)
+        final_folder = self._resolve_folder(folder_name)
         
         if not os.path.exists(final_folder):
             info_logger.warning(f"Folder does not exist: {final_folder}")
@@ -24,19 +137,32 @@ class DataLoader:
         all_data_file = os.path.join(final_folder, 'all_data.json')
         if os.path.exists(all_data_file):
             info_logger.info(f"Loading from new format: {all_data_file}")
+            
+            # Reuse the parsed list while the file keeps its mtime and size
+            use_cache = folder_name in _CACHED_FOLDERS
+            if use_cache:
+                cache_path = f'{all_data_file}.pkl'
+                file_stat = os.stat(all_data_file)
+                cache_key = (file_stat.st_mtime_ns, file_stat.st_size)
+                data = _load_pickle_cache(cache_path, cache_key)
+                if data is not None:
+                    info_logger.info(f"Loaded {len(data)} items from cache {cache_path}")
+                    return data
+            
             try:
-                with open(all_data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Ensure we return a list (data could be empty list or None)
-                    if data is None:
-                        info_logger.warning(f"all_data.json contains null data: {all_data_file}")
-                        return []
-                    elif isinstance(data, list):
-                        info_logger.info(f"Loaded {len(data)} items from {all_data_file}")
-                        return data
-                    else:
-                        info_logger.error(f"Unexpected data type in {all_data_file}: {type(data)}")
-                        return []
+                data = _read_json_file(all_data_file, use_mmap=True)
+                # Ensure we return a list (data could be empty list or None)
+                if data is None:
+                    info_logger.warning(f"all_data.json contains null data: {all_data_file}")
+                    return []
+                elif isinstance(data, list):
+                    info_logger.info(f"Loaded {len(data)} items from {all_data_file}")
+                    if use_cache:
+                        _store_pickle_cache(cache_path, cache_key, data)
+                    return data
+                else:
+                    info_logger.error(f"Unexpected data type in {all_data_file}: {type(data)}")
+                    return []
             except json.JSONDecodeError as e:
                 info_logger.error(f"JSON decode error in {all_data_file}: {e}")
                 return []
@@ -52,24 +178,32 @@ class DataLoader:
             info_logger.warning(f"No JSON files found in: {final_folder}")
             return []
         
-        all_data = []
-        for file_name in json_files:
-            info_logger.info(f"Loading legacy file: {file_name}")
-            try:
-                with open(file_name, 'r', encoding='utf-8') as f:
-                    file_data = json.load(f)
-                    if isinstance(file_data, list):
-                        all_data.extend(file_data)
-                    else:
-                        all_data.append(file_data)
-            except json.JSONDecodeError as e:
-                info_logger.error(f"JSON decode error in {file_name}: {e}")
-                continue
-            except Exception as e:
-                info_logger.error(f"Error reading {file_name}: {e}")
-                continue
+        # Reuse the merged list while no file was added, removed or changed
+        use_cache = folder_name in _CACHED_FOLDERS
+        if use_cache:
+            cache_path = os.path.join(final_folder, '.legacy_data.pkl')
+            cache_key = legacy_files_digest(json_files)
+            all_data = _load_pickle_cache(cache_path, cache_key)
+            if all_data is not None:
+                info_logger.info(f"Loaded {len(all_data)} total items from cache {cache_path}")
+                return all_data
+        
+        # The files are independent, so read and parse them on a thread pool;
+        # map keeps the results in file order
+        if len(json_files) > 1:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(json_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_read_legacy_file, json_files))
+        else:
+            results = [_read_legacy_file(json_files[0])]
+        
+        all_data = list(_iter_legacy_items(results))
+        read_errors = not all(ok for ok, _ in results)
         
         info_logger.info(f"Loaded {len(all_data)} total items from {len(json_files)} legacy files")
+        # Partial results are not cached, so the errors are reported again next time
+        if use_cache and not read_errors:
+            _store_pickle_cache(cache_path, cache_key, all_data)
         return all_data
 
     def read_raw_json_data_from_file(self, folder_name, file_name):
@@ -77,17 +211,16 @@ class DataLoader:
         Read a single JSON file. This method is used for individual commit details.
         Path format: folder_name/file_name.json
         """
-        final_path = os.path.join(self._folder_path, f'{folder_name}/{file_name}.json')
+        final_path = os.path.join(self._resolve_folder(folder_name), f'{file_name}.json')
         
         if not os.path.exists(final_path):
             info_logger.warning(f"File does not exist: {final_path}")
             return {}
         
         try:
-            with open(final_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                info_logger.debug(f"Loaded individual file: {final_path}")
-                return data if data is not None else {}
+            data = _read_json_file(final_path)
+            info_logger.debug(f"Loaded individual file: {final_path}")
+            return data if data is not None else {}
         except json.JSONDecodeError as e:
             info_logger.error(f"JSON decode error in {final_path}: {e}")
             return {}
@@ -114,33 +247,41 @@ class DataLoader:
             return structure_report
         
         # Check main folders
-        for item in os.listdir(self._folder_path):
-            item_path = os.path.join(self._folder_path, item)
-            if os.path.isdir(item_path):
-                structure_report['folders_found'].append(item)
-        
-        # Check pull structure
-        pull_path = os.path.join(self._folder_path, 'pull')
-        if os.path.exists(pull_path):
-            structure_report['pull_structure']['all_data_exists'] = os.path.exists(
-                os.path.join(pull_path, 'all_data.json')
-            )
-            structure_report['pull_structure']['pr_folders'] = [
-                item for item in os.listdir(pull_path)
-                if os.path.isdir(os.path.join(pull_path, item)) and item.isdigit()
-            ][:5]  # Show first 5 PR folders
+        with os.scandir(self._folder_path) as it:
+            structure_report['folders_found'] = [entry.name for entry in it if entry.is_dir()]
+        
+        # Check pull structure: one pass finds all_data.json and the PR folders
+        pull_path = self._pull_dir
+        if 'pull' in structure_report['folders_found']:
+            pull_all_data_exists = False
+            pr_folders = []
+            with os.scandir(pull_path) as it:
+                for entry in it:
+                    if entry.name == 'all_data.json':
+                        pull_all_data_exists = True
+                    elif entry.name.isdigit() and entry.is_dir():
+                        pr_folders.append(entry.name)
+            structure_report['pull_structure']['all_data_exists'] = pull_all_data_exists
+            structure_report['pull_structure']['pr_folders'] = pr_folders[:5]  # Show first 5 PR folders
         
         # Check commit structure
-        commit_path = os.path.join(self._folder_path, 'commit')
-        if os.path.exists(commit_path):
-            structure_report['commit_structure']['all_data_exists'] = os.path.exists(
-                os.path.join(commit_path, 'all_data.json')
-            )
-            commit_all_path = os.path.join(commit_path, 'all')
-            if os.path.exists(commit_all_path):
-                commit_files = [f for f in os.listdir(commit_all_path) if f.endswith('.json')]
-                structure_report['commit_structure']['individual_commits_count'] = len(commit_files)
-                structure_report['commit_structure']['sample_commit_files'] = commit_files[:3]
+        commit_path = self._commit_dir
+        if 'commit' in structure_report['folders_found']:
+            with os.scandir(commit_path) as it:
+                commit_entries = {entry.name: entry.is_dir() for entry in it}
+            structure_report['commit_structure']['all_data_exists'] = 'all_data.json' in commit_entries
+            if commit_entries.get('all'):
+                # Count the commit files without building a list of every name
+                commit_files_count = 0
+                sample_commit_files = []
+                with os.scandir(self._commit_all_dir) as it:
+                    for entry in it:
+                        if entry.name.endswith('.json'):
+                            commit_files_count += 1
+                            if len(sample_commit_files) < 3:
+                                sample_commit_files.append(entry.name)
+                structure_report['commit_structure']['individual_commits_count'] = commit_files_count
+                structure_report['commit_structure']['sample_commit_files'] = sample_commit_files
         
         info_logger.info(f"Data structure report: {structure_report}")
         return structure_report
@@ -157,26 +298,28 @@ class DataLoader:
             issues.append(f"Base folder does not exist: {self._folder_path}")
             return False, issues
         
-        # Check pull folder
-        pull_path = os.path.join(self._folder_path, 'pull')
-        if not os.path.exists(pull_path):
+        # One listing of the base and commit folders answers their existence checks
+        with os.scandir(self._folder_path) as it:
+            folders = {entry.name for entry in it if entry.is_dir()}
+        
+        # Check pull folder (not listed: it holds one folder per PR, so a single stat is cheaper)
+        if 'pull' not in folders:
             issues.append("'pull' folder not found")
         else:
-            pull_all_data = os.path.join(pull_path, 'all_data.json')
+            pull_all_data = os.path.join(self._pull_dir, 'all_data.json')
             if not os.path.exists(pull_all_data):
                 issues.append("'pull/all_data.json' not found")
         
         # Check commit folder
-        commit_path = os.path.join(self._folder_path, 'commit')
-        if not os.path.exists(commit_path):
+        if 'commit' not in folders:
             issues.append("'commit' folder not found")
         else:
-            commit_all_data = os.path.join(commit_path, 'all_data.json')
-            if not os.path.exists(commit_all_data):
+            with os.scandir(self._commit_dir) as it:
+                commit_entries = {entry.name for entry in it}
+            if 'all_data.json' not in commit_entries:
                 issues.append("'commit/all_data.json' not found")
             
-            commit_all_path = os.path.join(commit_path, 'all')
-            if not os.path.exists(commit_all_path):
+            if 'all' not in commit_entries:
                 issues.append("'commit/all' folder not found")
         
         is_compatible = len(issues) == 0
@@ -0,0 +1,27 @@
+import os
+
+_REPOSITORY_FOLDERS = {'pull', 'commit'}
+
+
+def discover_repositories(base_dir):
+    """
+    Names of the crawled repositories in base_dir, i.e. the folders that
+    contain both a pull/ and a commit/ folder.
+    """
+    if not base_dir or not os.path.isdir(base_dir):
+        return []
+    
+    repositories = []
+    with os.scandir(base_dir) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            # One listing of the candidate answers both folder checks from its dirents
+            try:
+                with os.scandir(entry.path) as sub_it:
+                    folders = {sub_entry.name for sub_entry in sub_it if sub_entry.is_dir()}
+            except OSError:
+                continue
+            if _REPOSITORY_FOLDERS <= folders:
+                repositories.append(entry.name)
+    return repositories
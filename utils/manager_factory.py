@@ -1,6 +1,12 @@
+import logging
+import os
+from functools import cached_property
+from glob import glob
+
 from models import Manager
-from .cache import Cache
+from .cache import CACHE_VERSION, Cache
 from .data_converter import DataConverter
+from .data_loader import legacy_files_digest
 from .logger import info_logger
 
 
@@ -14,8 +20,8 @@ class ManagerFactory:
         self._project_path = f'{crawled_data_folder_path}/{project_name}'
         self._data_converter = DataConverter(self._project_path)
         
-        info_logger.info(f'ManagerFactory initialized for project: {project_name}')
-        info_logger.info(f'Project data path: {self._project_path}')
+        info_logger.info('ManagerFactory initialized for project: %s', project_name)
+        info_logger.info('Project data path: %s', self._project_path)
 
     def get_manager(self):
         """
@@ -39,27 +45,29 @@ class ManagerFactory:
         try:
             # Load and convert data
             info_logger.info('Starting data conversion process...')
-            converted_data = self._data_converter.load_and_convert()
+            converted_data = self._converted_data
             
             # Validate converted data
             self._validate_converted_data(converted_data)
             
             # Populate manager with converted data
-            self._populate_manager(manager, converted_data)
+            population_stats = self._populate_manager(manager, converted_data)
             
             # Validate final manager state
-            self._validate_manager_completeness(manager)
+            self._validate_manager_completeness(manager, population_stats)
             
             info_logger.info('Manager created successfully')
             
-            # Cache the manager
-            Cache.store(self._cache_file_name, manager)
+            # Cache the manager, replacing the one stored for older inputs
+            cache_file_name = self._cache_file_name
+            Cache.remove_stale(self._cache_prefix, keep=cache_file_name)
+            Cache.store(cache_file_name, manager)
             info_logger.info('Manager stored in cache')
             
             return manager
             
         except Exception as e:
-            info_logger.error(f'Error creating manager: {str(e)}')
+            info_logger.error('Error creating manager: %s', e)
             raise RuntimeError(f'Failed to create manager for project {self._project_name}: {str(e)}')
 
     def _validate_data_structure(self):
@@ -79,9 +87,12 @@ class ManagerFactory:
             info_logger.error(error_msg)
             raise ValueError(error_msg)
         
-        # Log structure report for debugging
-        structure_report = data_loader.check_data_structure()
-        info_logger.info(f'Data structure validation passed. Report: {structure_report}')
+        # The structure report walks pull/ and commit/all/, so only build it when debugging
+        if info_logger.isEnabledFor(logging.DEBUG):
+            structure_report = data_loader.check_data_structure()
+            info_logger.debug('Data structure validation passed. Report: %s', structure_report)
+        else:
+            info_logger.info('Data structure validation passed')
 
     def _validate_converted_data(self, converted_data):
         """
@@ -104,11 +115,12 @@ class ManagerFactory:
         critical_components = ['pull_requests', 'developers']
         for component in critical_components:
             if not converted_data[component]:
-                info_logger.warning(f'Critical component {component} is empty')
+                info_logger.warning('Critical component %s is empty', component)
         
         # Log data statistics
-        data_stats = {key: len(value) for key, value in converted_data.items()}
-        info_logger.info(f'Converted data statistics: {data_stats}')
+        if info_logger.isEnabledFor(logging.INFO):
+            data_stats = {key: len(value) for key, value in converted_data.items()}
+            info_logger.info('Converted data statistics: %s', data_stats)
         
         # Check for reasonable data relationships
         self._validate_data_relationships(converted_data)
@@ -130,10 +142,10 @@ class ManagerFactory:
         # Check review-to-PR ratio
         if pr_count > 0:
             review_ratio = review_count / pr_count
-            info_logger.info(f'Review coverage ratio: {review_ratio:.2f} reviews per PR')
+            info_logger.info('Review coverage ratio: %.2f reviews per PR', review_ratio)
             
             if review_ratio < 0.1:
-                info_logger.warning(f'Low review coverage: {review_ratio:.2f} reviews per PR')
+                info_logger.warning('Low review coverage: %.2f reviews per PR', review_ratio)
 
     def _populate_manager(self, manager, converted_data):
         """
@@ -145,78 +157,58 @@ class ManagerFactory:
         population_stats = {}
         
         # Add pull requests
-        for pr in converted_data['pull_requests']:
-            manager.add_pull_request(pr)
+        manager.bulk_add_pull_requests(converted_data['pull_requests'])
         population_stats['pull_requests'] = len(converted_data['pull_requests'])
         
         # Add comments
-        for comment in converted_data['comments']:
-            manager.add_comment(comment)
+        manager.bulk_add_comments(converted_data['comments'])
         population_stats['comments'] = len(converted_data['comments'])
         
         # Add reviews
-        for review in converted_data['reviews']:
-            manager.add_review(review)
+        manager.bulk_add_reviews(converted_data['reviews'])
         population_stats['reviews'] = len(converted_data['reviews'])
         
         # Add commits
-        for commit in converted_data['commits']:
-            manager.add_commit(commit)
+        manager.bulk_add_commits(converted_data['commits'])
         population_stats['commits'] = len(converted_data['commits'])
         
         # Add developers
-        for developer in converted_data['developers']:
-            manager.add_developer(developer)
+        manager.bulk_add_developers(converted_data['developers'])
         population_stats['developers'] = len(converted_data['developers'])
         
         # Add contributions
-        for contribution in converted_data['contributions']:
-            manager.add_contribution(contribution)
+        manager.bulk_add_contributions(converted_data['contributions'])
         population_stats['contributions'] = len(converted_data['contributions'])
         
         # Add files
-        for file in converted_data['files']:
-            manager.add_file(file)
+        manager.bulk_add_files(converted_data['files'])
         population_stats['files'] = len(converted_data['files'])
         
         # Add review files
-        for review_file in converted_data['review_files']:
-            manager.add_review_file(review_file)
+        manager.bulk_add_review_files(converted_data['review_files'])
         population_stats['review_files'] = len(converted_data['review_files'])
         
-        info_logger.info(f'Manager population completed: {population_stats}')
+        info_logger.info('Manager population completed: %s', population_stats)
+        return population_stats
 
-    def _validate_manager_completeness(self, manager):
+    def _validate_manager_completeness(self, manager, population_stats):
         """
         Validate that the manager was populated correctly.
+        population_stats are the counts _populate_manager already logged.
         """
         info_logger.info('Validating manager completeness...')
         
-        # Check manager dictionaries are populated
-        manager_stats = {
-            'files': len(manager.files),
-            'developers': len(manager.developers),
-            'pull_requests': len(manager.pull_requests),
-            'reviews': len(manager.reviews),
-            'commits': len(manager.commits),
-            'comments_files': len(manager.comments),
-            'contributions_files': len(manager.contributions),
-            'review_files': len(manager.review_files)
-        }
-        
-        info_logger.info(f'Final manager statistics: {manager_stats}')
-        
         # Check for critical empty collections
-        if manager_stats['pull_requests'] == 0:
+        if population_stats['pull_requests'] == 0:
             raise ValueError('Manager has no pull requests - this indicates a data loading problem')
         
-        if manager_stats['developers'] == 0:
+        if population_stats['developers'] == 0:
             raise ValueError('Manager has no developers - this indicates a data loading problem')
         
         # Validate cached properties work
         try:
-            _ = len(manager.pull_requests_list)
-            _ = len(manager.developers_list)
+            _ = manager.pull_requests_list
+            _ = manager.developers_list
             info_logger.info('Manager cached properties validation passed')
         except Exception as e:
             raise ValueError(f'Manager cached properties validation failed: {str(e)}')
@@ -229,20 +221,44 @@ class ManagerFactory:
         
         if not hasattr(manager, 'project') or manager.project != self._project_name:
             info_logger.warning('Cached manager project mismatch')
-            
-        # Quick validation of cached manager
+        
+        # The cache key only covers the top-level pull/ and commit/ inputs, so
+        # still make sure the cached collections are usable
         try:
             pr_count = len(manager.pull_requests_list)
             dev_count = len(manager.developers_list)
-            info_logger.info(f'Cached manager contains {pr_count} PRs and {dev_count} developers')
+            info_logger.info('Cached manager contains %s PRs and %s developers', pr_count, dev_count)
         except Exception as e:
-            info_logger.error(f'Cached manager validation failed: {str(e)}')
+            info_logger.error('Cached manager validation failed: %s', e)
             raise ValueError('Cached manager is corrupted')
 
+    @cached_property
+    def _converted_data(self):
+        """Converted crawled data, shared by get_data_summary and get_manager"""
+        return self._data_converter.load_and_convert()
+
     @property
-    def _cache_file_name(self):
+    def _cache_prefix(self):
         return f'{self._project_name}.data-manager'
 
+    @property
+    def _cache_file_name(self):
+        """
+        Cache key naming the mtime and size of pull/ and commit/ all_data.json,
+        or for legacy folders without one a digest of their top-level *.json files.
+        Changes below those folders (pull/<n>/, commit/all/) are not detected;
+        rebuild with from_cache=False after editing them.
+        """
+        input_stats = []
+        for folder in ('pull', 'commit'):
+            folder_path = os.path.join(self._project_path, folder)
+            try:
+                file_stat = os.stat(os.path.join(folder_path, 'all_data.json'))
+                input_stats.append(f'{file_stat.st_mtime_ns}-{file_stat.st_size}')
+            except OSError:
+                input_stats.append(legacy_files_digest(glob(os.path.join(folder_path, '*.json'))))
+        return f'{self._cache_prefix}.{"-".join(input_stats)}.v{CACHE_VERSION}'
+
     def get_data_summary(self):
         """
         Get a summary of the data structure without creating a full manager.
@@ -267,7 +283,7 @@ class ManagerFactory:
             if is_compatible:
                 # Try to get basic data counts
                 try:
-                    converted_data = self._data_converter.load_and_convert()
+                    converted_data = self._converted_data
                     summary['data_counts'] = {key: len(value) for key, value in converted_data.items()}
                 except Exception as e:
                     summary['data_conversion_error'] = str(e)
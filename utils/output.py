@@ -0,0 +1,20 @@
+import io
+import sys
+from contextlib import redirect_stdout
+from functools import wraps
+
+
+def buffered_output(func):
+    """
+    Collect everything func prints in memory and write it to stdout in one
+    go when it returns or raises, instead of one write per print call.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    return wrapper
@@ -0,0 +1,46 @@
+import multiprocessing
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from .cache import PICKLE_PROTOCOL
+
+_shared_manager = None
+
+
+def _init_worker(manager_bytes):
+    global _shared_manager
+    if manager_bytes is not None:
+        _shared_manager = pickle.loads(manager_bytes)
+
+
+def shared_manager():
+    """
+    The manager given to manager_process_pool, for tasks running in its workers.
+    """
+    return _shared_manager
+
+
+@contextmanager
+def manager_process_pool(manager, max_workers):
+    """
+    A ProcessPoolExecutor whose tasks can all read manager through shared_manager().
+    On Linux the workers are forked and inherit it. Elsewhere they use the
+    platform's default start method, and it is pickled once and unpickled once per worker.
+    """
+    global _shared_manager
+    if sys.platform.startswith('linux'):
+        context = multiprocessing.get_context('fork')
+        _shared_manager = manager
+        manager_bytes = None
+    else:
+        context = multiprocessing.get_context()
+        manager_bytes = pickle.dumps(manager, protocol=PICKLE_PROTOCOL)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(manager_bytes,)) as executor:
+            yield executor
+    finally:
+        _shared_manager = None
@@ -6,6 +6,14 @@ def calc_sorted_candidates(all_candidates: Dict[str, float]):
 
 
 def calc_rank_from_score(candidate: str, all_candidates: Dict[str, float]):
-    sorted_candidates = calc_sorted_candidates(all_candidates)
-    index = list(sorted_candidates.keys()).index(candidate)
+    # Index of candidate in calc_sorted_candidates without sorting: every
+    # candidate scored higher, plus tied ones listed before it (the sort is stable)
+    score = all_candidates[candidate]
+    index = 0
+    seen = False
+    for other_candidate, other_score in all_candidates.items():
+        if other_candidate == candidate:
+            seen = True
+        elif other_score > score or (other_score == score and not seen):
+            index += 1
     return index